@@ -0,0 +1,96 @@
+"""
+Compares the fast site-specific extractors against newspaper3k on saved pages.
+
+Usage:
+    python benchmark_extractors.py save <pages_dir> <url> [<url> ...]
+    python benchmark_extractors.py run <pages_dir> [repeats]
+
+`save` downloads each URL into <pages_dir> and records it in manifest.json.
+`run` times both extractors on every saved page and reports text fidelity
+(similarity of the fast extraction to the newspaper3k extraction).
+"""
+import sys
+import io
+import os
+import json
+import time
+import difflib
+
+# Apply encoding fix
+sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+from src.source_fetching.scraper import download_html, parse_with_newspaper
+from src.source_fetching.extractors import extract_text
+
+MANIFEST = "manifest.json"
+
+def load_manifest(pages_dir):
+    path = os.path.join(pages_dir, MANIFEST)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_pages(pages_dir, urls):
+    os.makedirs(pages_dir, exist_ok=True)
+    manifest = load_manifest(pages_dir)
+    for url in urls:
+        try:
+            html = download_html(url)
+        except Exception as e:
+            print(f"FAILURE: Could not download {url}: {e}")
+            continue
+        filename = f"page_{len(manifest):03d}.html"
+        with open(os.path.join(pages_dir, filename), 'w', encoding='utf-8') as f:
+            f.write(html)
+        manifest[filename] = url
+        print(f"Saved {url} -> {filename}")
+    with open(os.path.join(pages_dir, MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+def time_call(func, repeats):
+    start = time.perf_counter()
+    result = None
+    for _ in range(repeats):
+        result = func()
+    return result, (time.perf_counter() - start) / repeats * 1000
+
+def fidelity(candidate, reference):
+    """Word-level similarity ratio between two extractions (1.0 = identical)."""
+    if not candidate or not reference:
+        return 0.0
+    return difflib.SequenceMatcher(None, candidate.split(), reference.split(), autojunk=False).ratio()
+
+def run_benchmark(pages_dir, repeats):
+    manifest = load_manifest(pages_dir)
+    if not manifest:
+        print(f"No saved pages found in {pages_dir}. Use 'save' first.")
+        return
+
+    print(f"{'page':<14}{'fast ms':>10}{'np3k ms':>10}{'speedup':>10}{'fidelity':>10}  url")
+    fast_total, newspaper_total = 0.0, 0.0
+    for filename, url in manifest.items():
+        with open(os.path.join(pages_dir, filename), encoding='utf-8') as f:
+            html = f.read()
+
+        fast_text, fast_ms = time_call(lambda: extract_text(url, html), repeats)
+        newspaper_text, newspaper_ms = time_call(lambda: parse_with_newspaper(url, html), repeats)
+        fast_total += fast_ms
+        newspaper_total += newspaper_ms
+
+        if fast_text is None:
+            print(f"{filename:<14}{'-':>10}{newspaper_ms:>10.1f}{'-':>10}{'-':>10}  {url} (fast path declined)")
+            continue
+        speedup = newspaper_ms / fast_ms if fast_ms else float('inf')
+        print(f"{filename:<14}{fast_ms:>10.1f}{newspaper_ms:>10.1f}{speedup:>9.1f}x{fidelity(fast_text, newspaper_text):>10.2f}  {url}")
+
+    print(f"\nTotal: fast {fast_total:.1f} ms, newspaper3k {newspaper_total:.1f} ms over {len(manifest)} pages.")
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 4 and sys.argv[1] == "save":
+        save_pages(sys.argv[2], sys.argv[3:])
+    elif len(sys.argv) >= 3 and sys.argv[1] == "run":
+        run_benchmark(sys.argv[2], int(sys.argv[3]) if len(sys.argv) > 3 else 5)
+    else:
+        print(__doc__)
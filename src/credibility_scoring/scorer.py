@@ -24,4 +24,8 @@ def calculate_credibility_score(supporting_articles: List[Dict[str, Any]], total
         f"{strength}: {len(supporting_articles)} out of {total_considered_articles} "
         f"trusted sources ({score:.1f}%) showed significant similarity to the input claims."
     )
+    # Syndicated copies were folded into their original and counted once
+    syndicated = sum(len(article.get("duplicate_urls", [])) for article in supporting_articles)
+    if syndicated:
+        explanation += f" {syndicated} syndicated copies of these reports were counted once."
     return score, explanation
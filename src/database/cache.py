@@ -1,6 +1,12 @@
 from typing import Dict, Any, Optional
+from collections import deque
+import hashlib
 import json
 import re
+import numpy as np
+
+from ..similarity_computation.calculator import calculate_similarity
+from ..similarity_computation.near_duplicates import minhash_signature, estimate_similarity, words
 
 # Helper to sanitize strings for console output
 def _sanitize(text: str) -> str:
@@ -15,25 +21,136 @@ def _sanitize(text: str) -> str:
     return sanitized[:50]
 
 # In a real application, this would be a persistent database (e.g., SQLite)
+# Both caches are keyed by a digest of the text rather than the text itself, and cached
+# results hold compact references instead of full article/input texts.
 _article_cache: Dict[str, Any] = {}
 _vector_cache: Dict[str, Any] = {}
 
-def get_cached_article(raw_text: str) -> Optional[Dict[str, Any]]:
-    """Retrieves a cached article result by its raw text."""
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def _text_ref(text: str) -> Dict[str, Any]:
+    return {"sha256": _digest(text), "chars": len(text)}
+
+def _compact(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Replaces the full extracted text and raw text/image inputs with digest references."""
+    compact = {key: value for key, value in result.items() if key != "extracted_text"}
+    compact["extracted_text_ref"] = _text_ref(result.get("extracted_text") or "")
+    raw_input = dict(result.get("raw_input") or {})
+    for field in ("text", "image"):
+        if raw_input.get(field):
+            raw_input[field] = _text_ref(raw_input[field])
+    compact["raw_input"] = raw_input
+    return compact
+
+def _expand(key: str, raw_text: str, raw_input: Optional[Dict[str, Any]], **extra) -> Dict[str, Any]:
+    """
+    Rebuilds an API response from a compact cache entry for the current submission.
+    The digest references are internal: the submitted text replaces extracted_text_ref,
+    and the current request's input replaces the cached raw_input when given.
+    """
+    result = {k: v for k, v in _article_cache[key].items() if k != "extracted_text_ref"}
+    result.update(extracted_text=raw_text, **extra)
+    if raw_input is not None:
+        result["raw_input"] = raw_input
+    return result
+
+# Second-level lookup for near-identical submissions (whitespace changes, trailing ads, OCR noise).
+# A fuzzy hit needs BOTH a near-identical embedding and a high shingle overlap.
+FUZZY_VECTOR_THRESHOLD = 0.96
+FUZZY_SHINGLE_THRESHOLD = 0.6
+MAX_RECENT_ANALYSES = 500
+# Shorter canonical texts are too generic to share a verdict on an exact fingerprint match
+MIN_FINGERPRINT_CHARS = 40
+
+_fingerprint_index: Dict[str, str] = {}
+# (article cache key, input vector, MinHash signature) for the most recent analyses
+_recent_analyses: deque = deque(maxlen=MAX_RECENT_ANALYSES)
+
+def content_fingerprint(text: str) -> Optional[str]:
+    """
+    Hashes the canonical form of a text (lowercase words in any script, no punctuation
+    or spacing). Returns None when the canonical text is too short to fingerprint.
+    """
+    canonical = " ".join(words(text))
+    if len(canonical) < MIN_FINGERPRINT_CHARS:
+        return None
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def get_cached_article(raw_text: str, raw_input: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """Retrieves a cached article result by its raw text, answering for `raw_input` (the current request's input)."""
     print(f"Checking cache for article: {_sanitize(raw_text)}...")
-    return _article_cache.get(raw_text)
+    key = _digest(raw_text)
+    if key not in _article_cache:
+        return None
+    return _expand(key, raw_text, raw_input)
 
-def cache_article(raw_text: str, result: Dict[str, Any]):
-    """Caches an article result by its raw text."""
+def cache_article(raw_text: str, result: Dict[str, Any], input_vector: Optional[np.ndarray] = None):
+    """Caches a compact article result by its raw text and indexes it for fuzzy lookup."""
     print(f"Caching article result for: {_sanitize(raw_text)}...")
-    _article_cache[raw_text] = result
+    key = _digest(raw_text)
+    _article_cache[key] = _compact(result)
+
+    fingerprint = content_fingerprint(raw_text)
+    if fingerprint:
+        _fingerprint_index[fingerprint] = key
+    if input_vector is not None:
+        signature = minhash_signature(raw_text)
+        if signature is not None:
+            _recent_analyses.append((key, input_vector, signature))
+
+def get_fingerprint_cached_article(raw_text: str, raw_input: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Second-level cache lookup by canonical content fingerprint (same words, different
+    spacing or punctuation). Needs no input vector, so it runs before vectorization.
+    """
+    fingerprint = content_fingerprint(raw_text)
+    key = _fingerprint_index.get(fingerprint) if fingerprint else None
+    if key not in _article_cache:
+        return None
+    print("Fingerprint cache hit.")
+    return _expand(key, raw_text, raw_input, cache_hit={"type": "fingerprint"})
+
+def get_fuzzy_cached_article(raw_text: str, input_vector: np.ndarray, raw_input: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Third-level cache lookup for near-identical submissions: embedding and shingle
+    similarity against recent analyses. Returns a copy of the cached result with
+    a `cache_hit` entry describing the match, or None.
+    """
+    signature = minhash_signature(raw_text)
+    if signature is None:
+        return None
+
+    best = None
+    for key, vector, cached_signature in _recent_analyses:
+        if key not in _article_cache:
+            continue
+        vector_similarity = calculate_similarity(input_vector, vector)
+        if vector_similarity < FUZZY_VECTOR_THRESHOLD:
+            continue
+        shingle_similarity = estimate_similarity(signature, cached_signature)
+        if shingle_similarity < FUZZY_SHINGLE_THRESHOLD:
+            continue
+        if best is None or vector_similarity > best[1]:
+            best = (key, vector_similarity, shingle_similarity)
+
+    if not best:
+        return None
+
+    key, vector_similarity, shingle_similarity = best
+    print(f"Fuzzy cache hit (vector {vector_similarity:.3f}, shingles {shingle_similarity:.2f}).")
+    return _expand(key, raw_text, raw_input, cache_hit={
+        "type": "fuzzy",
+        "vector_similarity": vector_similarity,
+        "shingle_similarity": shingle_similarity
+    })
 
 def get_cached_vector(preprocessed_text: str) -> Optional[Any]:
     """Retrieves a cached vector by its preprocessed text."""
     print(f"Checking cache for vector: {_sanitize(preprocessed_text)}...")
-    return _vector_cache.get(preprocessed_text)
+    return _vector_cache.get(_digest(preprocessed_text))
 
 def cache_vector(preprocessed_text: str, vector: Any):
     """Caches a vector by its preprocessed text."""
     print(f"Caching vector for: {_sanitize(preprocessed_text)}...")
-    _vector_cache[preprocessed_text] = vector
+    _vector_cache[_digest(preprocessed_text)] = vector
@@ -0,0 +1,169 @@
+import os
+import json
+import time
+import tempfile
+import threading
+import numpy as np
+from contextlib import contextmanager
+from typing import Any, Dict, List, Tuple
+
+# POSIX file locks coordinate gunicorn workers; without fcntl (Windows) only
+# in-process locking applies, which is fine for a single dev worker.
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# On-disk corpus of pre-ingested trusted-source articles, scored at request time
+# without any network I/O. Metadata and text live in articles.jsonl, embeddings
+# in vectors.npy (row i belongs to line i).
+CORPUS_DIR = os.getenv("CORPUS_DIR", "data/corpus")
+MAX_CORPUS_ARTICLES = int(os.getenv("CORPUS_MAX_ARTICLES", "5000"))
+MAX_CORPUS_AGE_DAYS = float(os.getenv("CORPUS_MAX_AGE_DAYS", "14"))
+
+VECTOR_DIMENSION = 384
+
+@contextmanager
+def _file_lock(path: str, blocking: bool = True):
+    """Cross-process exclusive lock on `path`; yields whether it was acquired."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as handle:
+        if fcntl is None:
+            yield True
+            return
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+class TrustedCorpus:
+    """Thread-safe, size- and age-limited article corpus with cosine search over its vectors."""
+
+    def __init__(self, directory: str = CORPUS_DIR, max_articles: int = MAX_CORPUS_ARTICLES, max_age_days: float = MAX_CORPUS_AGE_DAYS):
+        self.directory = directory
+        self.max_articles = max_articles
+        self.max_age_days = max_age_days
+        self._entries: List[Dict[str, Any]] = []
+        self._vectors = np.zeros((0, VECTOR_DIMENSION), dtype=np.float32)
+        self._urls = set()
+        self._lock = threading.Lock()
+
+    @property
+    def _articles_path(self) -> str:
+        return os.path.join(self.directory, "articles.jsonl")
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self.directory, "vectors.npy")
+
+    def ingestion_lock(self):
+        """Non-blocking lock that makes one process the corpus's single ingesting writer."""
+        return _file_lock(os.path.join(self.directory, ".ingest.lock"), blocking=False)
+
+    def _write_lock(self):
+        """Short blocking lock held while the files are written or read."""
+        return _file_lock(os.path.join(self.directory, ".write.lock"))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def has(self, url: str) -> bool:
+        return url in self._urls
+
+    def load(self):
+        """Loads the corpus from disk (missing or mismatched files start an empty corpus)."""
+        if not (os.path.exists(self._articles_path) and os.path.exists(self._vectors_path)):
+            print(f"No corpus found in {self.directory}; starting empty.")
+            return
+        try:
+            with self._write_lock():
+                with open(self._articles_path, encoding="utf-8") as f:
+                    entries = [json.loads(line) for line in f if line.strip()]
+                vectors = np.load(self._vectors_path)
+        except Exception as e:
+            print(f"Error loading corpus from {self.directory}: {e}")
+            return
+        if len(entries) != len(vectors):
+            print(f"Corpus files in {self.directory} are out of sync; starting empty.")
+            return
+
+        with self._lock:
+            self._entries = entries
+            self._vectors = vectors.astype(np.float32)
+            self._urls = {entry["url"] for entry in entries}
+        print(f"Loaded {len(entries)} corpus articles from {self.directory}.")
+
+    def save(self):
+        """Writes the corpus atomically (unique temp files, then rename under the write lock)."""
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock:
+            entries = list(self._entries)
+            vectors = self._vectors.copy()
+
+        # Unique temp files, so concurrent writers can never overwrite each other's output
+        articles_fd, articles_tmp = tempfile.mkstemp(dir=self.directory, prefix="articles.", suffix=".tmp")
+        vectors_fd, vectors_tmp = tempfile.mkstemp(dir=self.directory, prefix="vectors.", suffix=".tmp")
+        try:
+            with open(articles_fd, "w", encoding="utf-8") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            with open(vectors_fd, "wb") as f:
+                np.save(f, vectors)
+            with self._write_lock():
+                os.replace(articles_tmp, self._articles_path)
+                os.replace(vectors_tmp, self._vectors_path)
+        finally:
+            for path in (articles_tmp, vectors_tmp):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def add_batch(self, entries: List[Dict[str, Any]], vectors: np.ndarray):
+        """Adds newly ingested articles (each entry needs url, title, text, published, ingested_at)."""
+        if not entries:
+            return
+        # Normalize once so search is a plain dot product
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1, norms)
+
+        with self._lock:
+            self._entries.extend(entries)
+            self._vectors = np.vstack([self._vectors, vectors])
+            self._urls.update(entry["url"] for entry in entries)
+
+    def retention_cutoff(self) -> float:
+        """Oldest publish time (UNIX timestamp) the corpus keeps."""
+        return time.time() - self.max_age_days * 86400
+
+    def prune(self) -> int:
+        """Applies the retention limits (age, then size). Returns the number of articles dropped."""
+        cutoff = self.retention_cutoff()
+        with self._lock:
+            keep = [i for i, entry in enumerate(self._entries) if entry.get("published", entry["ingested_at"]) >= cutoff]
+            # Newest articles win when over the size limit
+            keep.sort(key=lambda i: self._entries[i].get("published", self._entries[i]["ingested_at"]), reverse=True)
+            keep = sorted(keep[:self.max_articles])
+
+            dropped = len(self._entries) - len(keep)
+            if dropped:
+                self._entries = [self._entries[i] for i in keep]
+                self._vectors = self._vectors[keep]
+                self._urls = {entry["url"] for entry in self._entries}
+        return dropped
+
+    def search(self, vector: np.ndarray, top_k: int = 20, min_similarity: float = 0.3) -> List[Tuple[Dict[str, Any], float]]:
+        """Returns up to `top_k` (entry, cosine similarity) pairs above `min_similarity`, best first."""
+        norm = np.linalg.norm(vector)
+        with self._lock:
+            if not self._entries or not norm:
+                return []
+            similarities = self._vectors @ (np.asarray(vector, dtype=np.float32) / norm)
+            order = np.argsort(similarities)[::-1][:top_k]
+            return [(self._entries[i], float(similarities[i])) for i in order if similarities[i] >= min_similarity]
+
+trusted_corpus = TrustedCorpus()
@@ -1,4 +1,5 @@
 import base64
+import asyncio
 import easyocr
 
 # Initialize reader once to avoid reloading model
@@ -16,7 +17,8 @@ async def process_image_input(image_base64: str) -> str:
         decoded_bytes = base64.b64decode(image_base64)
         
         # EasyOCR supports bytes directly
-        result = reader.readtext(decoded_bytes, detail=0)
+        # OCR is CPU-bound; run it in a worker thread so the event loop is not blocked
+        result = await asyncio.to_thread(reader.readtext, decoded_bytes, detail=0)
         
         return " ".join(result)
     except Exception as e:
@@ -0,0 +1,136 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pydantic import BaseModel
+
+from ..summarization.generator import gemini_guard
+
+TIER_FULL = "full"          # Every stage, LLM query generation, advanced search allowed
+TIER_REDUCED = "reduced"    # No optional LLM stages, local keyword query, basic search only
+TIER_LOCAL = "local"        # No request-time network I/O; answer from local caches and corpus only
+
+# Load thresholds (concurrent /analyze requests) and the latency budget that trigger degradation
+REDUCED_TIER_IN_FLIGHT = int(os.getenv("LOAD_REDUCED_AT", "4"))
+LOCAL_TIER_IN_FLIGHT = int(os.getenv("LOAD_LOCAL_AT", "12"))
+LATENCY_BUDGET_SECONDS = float(os.getenv("LATENCY_BUDGET_SECONDS", "20"))
+LATENCY_SMOOTHING = 0.2
+# Gemini calls a full-tier /analyze makes: event/entity extraction, plus query generation when no event is found
+GEMINI_CALLS_PER_ANALYZE = 2
+
+class ExecutionPlan(BaseModel):
+    tier: str
+    source_summaries: bool  # Per-source summaries (local extractive)
+    llm_query: bool         # Event/entity extraction and query generation via Gemini
+    advanced_search: bool   # Allow widening discovery to Tavily advanced search
+    network_sources: bool   # Search and scrape trusted sources at request time
+
+_PLANS = {
+    TIER_FULL: ExecutionPlan(tier=TIER_FULL, source_summaries=True, llm_query=True, advanced_search=True, network_sources=True),
+    TIER_REDUCED: ExecutionPlan(tier=TIER_REDUCED, source_summaries=False, llm_query=False, advanced_search=False, network_sources=True),
+    TIER_LOCAL: ExecutionPlan(tier=TIER_LOCAL, source_summaries=False, llm_query=False, advanced_search=False, network_sources=False),
+}
+
+class GeminiReservation:
+    """
+    Gemini calls a request may still make. The planner counts them against the
+    Gemini rate limit until they are made (use) or no longer needed (release).
+    """
+
+    def __init__(self, planner: "LoadPlanner", calls: int):
+        self._planner = planner
+        self.remaining = calls
+
+    def use(self):
+        """Marks one reserved call as made."""
+        if self.remaining:
+            self.remaining -= 1
+            self._planner._unreserve(1)
+
+    def release(self):
+        """Returns every call not made yet (the LLM stage is over)."""
+        if self.remaining:
+            self._planner._unreserve(self.remaining)
+            self.remaining = 0
+
+class LoadPlanner:
+    """
+    Chooses an execution tier for each /analyze request from the number of
+    requests in flight, the smoothed request latency and the Gemini circuit and
+    rate-limit state, so latency stays bounded under overload instead of queuing
+    without limit.
+    """
+
+    def __init__(self):
+        self._in_flight = 0
+        self._gemini_reserved = 0
+        self._latency = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def latency(self) -> float:
+        return self._latency
+
+    def plan(self) -> ExecutionPlan:
+        """Picks the tier for a request that is about to start."""
+        with self._lock:
+            in_flight = self._in_flight
+            gemini_reserved = self._gemini_reserved
+            latency = self._latency
+
+        # Gemini calls that running requests have yet to make compete for the same tokens.
+        # What the guard can serve within the latency budget is the tokens on hand plus the
+        # refill over the budget; a single request is always admitted so a low RPM cannot
+        # lock out the full tier.
+        bucket = gemini_guard.bucket
+        gemini_capacity = bucket.available_tokens + bucket.rate * LATENCY_BUDGET_SECONDS
+        gemini_saturated = gemini_reserved > 0 and gemini_reserved + GEMINI_CALLS_PER_ANALYZE > gemini_capacity
+
+        if in_flight >= LOCAL_TIER_IN_FLIGHT:
+            tier = TIER_LOCAL
+        elif (in_flight >= REDUCED_TIER_IN_FLIGHT or latency > LATENCY_BUDGET_SECONDS
+              or not gemini_guard.healthy or gemini_saturated):
+            tier = TIER_REDUCED
+        else:
+            tier = TIER_FULL
+
+        if tier != TIER_FULL:
+            print(f"Load planner: {in_flight} in flight, latency {latency:.1f}s -> {tier} tier.")
+        return _PLANS[tier]
+
+    def _unreserve(self, calls: int):
+        with self._lock:
+            self._gemini_reserved -= calls
+
+    @contextmanager
+    def track(self, plan: ExecutionPlan):
+        """
+        Counts a request as in flight and feeds its latency into the moving average.
+        Yields the request's GeminiReservation (empty unless it runs the LLM stages).
+        """
+        start = time.monotonic()
+        reservation = GeminiReservation(self, GEMINI_CALLS_PER_ANALYZE if plan.llm_query else 0)
+        with self._lock:
+            self._in_flight += 1
+            self._gemini_reserved += reservation.remaining
+        try:
+            yield reservation
+        finally:
+            reservation.release()
+            elapsed = time.monotonic() - start
+            with self._lock:
+                self._in_flight -= 1
+                if self._latency:
+                    self._latency += LATENCY_SMOOTHING * (elapsed - self._latency)
+                else:
+                    self._latency = elapsed
+
+def downgrade(plan: ExecutionPlan) -> ExecutionPlan:
+    """Returns the reduced plan for a full-tier request whose LLM stages failed mid-flight."""
+    return _PLANS[TIER_REDUCED] if plan.tier == TIER_FULL else plan
+
+planner = LoadPlanner()
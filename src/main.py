@@ -4,6 +4,7 @@ from fastapi.responses import FileResponse
 from pydantic import BaseModel
 import sys
 import io
+import asyncio
 
 # Set default encoding to utf-8 for stdout/stderr to handle Unicode on Windows
 # This prevents UnicodeEncodeError when printing emojis or non-English characters
@@ -15,11 +16,17 @@ from .input_handling.text_processor import process_text_input
 from .input_handling.image_processor import process_image_input
 from .nlp_processing.text_preprocessor import preprocess_text
 from .nlp_processing.vector_representation import get_text_vector
-from .source_fetching.fetcher import fetch_trusted_sources, SourceArticle
+from .nlp_processing.keyword_extractor import extract_keywords, extract_proper_nouns
+from .source_fetching.fetcher import fetch_trusted_sources, search_local_corpus, contains_entities, count_entity_mentions, SourceArticle
 from .similarity_computation.calculator import calculate_similarity
 from .credibility_scoring.scorer import calculate_credibility_score
-from .summarization.generator import generate_summary, extract_claims, generate_search_query, extract_event_and_entities
-from .database.cache import get_cached_article, cache_article, get_cached_vector, cache_vector
+from .summarization.generator import generate_summary, extract_claims, generate_search_query, extract_event_and_entities, Engine
+from .source_fetching.http_client import close_client
+from .source_fetching.ingestion import run_ingestion_loop, stop_ingestion, INGEST_INTERVAL_MINUTES
+from .database.corpus import trusted_corpus
+from .profiling.memory import MemoryProfiler
+from .load_management.planner import planner, downgrade, ExecutionPlan, GeminiReservation, TIER_FULL
+from .database.cache import get_cached_article, get_fingerprint_cached_article, get_fuzzy_cached_article, cache_article, get_cached_vector, cache_vector
 
 app = FastAPI(
     title="News Credibility Checker",
@@ -27,6 +34,29 @@ app = FastAPI(
     version="1.0.0"
 )
 
+_ingestion_task = None
+
+@app.on_event("startup")
+async def start_corpus_ingestion():
+    # Load the pre-ingested trusted corpus and keep it fresh in the background
+    global _ingestion_task
+    await asyncio.to_thread(trusted_corpus.load)
+    if INGEST_INTERVAL_MINUTES > 0:
+        _ingestion_task = asyncio.create_task(run_ingestion_loop(INGEST_INTERVAL_MINUTES))
+
+# Longest shutdown waits for an in-flight ingestion pass (it stops between network calls)
+INGEST_STOP_TIMEOUT_SECONDS = 30
+
+@app.on_event("shutdown")
+async def shutdown_http_client():
+    if _ingestion_task:
+        _ingestion_task.cancel()
+        # Cancelling does not stop the worker thread; wait for it before closing the pool it uses
+        if not await asyncio.to_thread(stop_ingestion, INGEST_STOP_TIMEOUT_SECONDS):
+            print("Ingestion pass still running at shutdown; closing the HTTP client anyway.")
+    # Release pooled outbound connections
+    close_client()
+
 class ArticleInput(BaseModel):
     url: str | None = None
     text: str | None = None
@@ -59,60 +89,218 @@ async def extract_content(article_input: ArticleInput):
     return raw_text
 
 @app.post("/summarize")
-async def summarize_article(article_input: ArticleInput):
+async def summarize_article(article_input: ArticleInput, engine: Engine | None = None):
     raw_text = await extract_content(article_input)
     
     # Generate Summary & Claims
-    summary = generate_summary(raw_text)
-    claims = extract_claims(raw_text)
+    # `engine` ("llm", "local" or "auto") overrides the configured engine for both stages
+    summary = await asyncio.to_thread(generate_summary, raw_text, engine)
+    claims = await asyncio.to_thread(extract_claims, raw_text, engine)
     
     return {
         "summary": summary,
         "claims": claims
     }
 
+# Similarity at which a trusted article counts as supporting the input
+SUPPORT_THRESHOLD = 0.4
+# Supporting corpus articles needed to answer without request-time search
+MIN_CORPUS_SUPPORT = 3
+# Proper-noun phrases taken from the input; corpus matches must mention a majority of them
+CORPUS_ENTITY_COUNT = 3
+# On both the corpus and the search path, the score's denominator ("considered") is the
+# retrieved trusted articles that passed the entity check, one per near-duplicate cluster.
+
+def truncation_note(considered: int, available: int) -> str:
+    """Explanation suffix for a verdict computed on only part of the retrieved sources."""
+    return (f" Only {considered} of {available} retrieved sources were compared because the "
+            f"memory budget was reached; the score may change on a full analysis.")
+
+DISCLAIMER = "This is an assistive tool, not a final authority on truth. Users must cross-check information independently."
+
 @app.post("/analyze")
 async def analyze_article(article_input: ArticleInput):
+    # Pick the execution tier before this request counts toward the load
+    plan = planner.plan()
+    # Opt-in (PROFILE_MEMORY=1) per-stage allocation tracking
+    profiler = MemoryProfiler()
+    with planner.track(plan) as reservation:
+        result = await run_analysis(article_input, plan, reservation, profiler)
+    if profiler.enabled:
+        result = {**result, "memory_profile": profiler.report()}
+    return result
+
+def compare_sources(trusted_articles: list[SourceArticle], input_vector, plan: ExecutionPlan, profiler: MemoryProfiler) -> tuple[list[dict], int]:
+    """
+    Vectorizes each source, compares it with the input and summarizes the supporting ones.
+    Each source text is released as soon as it has been processed. Returns the
+    supporting articles and the number of sources considered (sources skipped
+    because the request ran over its memory budget are not counted).
+    """
+    supporting_articles_info = []
+    considered = 0
+    
+    for source_article in trusted_articles:
+        if profiler.over_budget():
+            print(f"Memory budget of {profiler.budget_mb} MB exceeded; skipping remaining sources.")
+            break
+        considered += 1
+
+        if source_article.similarity is not None:
+            # Local corpus matches were already vectorized at ingestion time
+            similarity = source_article.similarity
+        else:
+            # Preprocess source text
+            preprocessed_text = preprocess_text(source_article.raw_text)
+            
+            # Check cache or vectorize
+            source_vector = get_cached_vector(preprocessed_text)
+            if source_vector is None:
+                source_vector = get_text_vector(preprocessed_text)
+                cache_vector(preprocessed_text, source_vector)
+
+            # 6. Similarity Computation (Stage 5)
+            similarity = calculate_similarity(input_vector, source_vector)
+
+        if similarity >= SUPPORT_THRESHOLD:
+            # Generate summary for the source article for the UI (skipped under load)
+            # Source summaries use the local extractive engine; they never leave the box
+            if plan.source_summaries:
+                source_summary = generate_summary(source_article.raw_text, engine="local")
+            else:
+                source_summary = source_article.raw_text[:200] + "..."
+            supporting_articles_info.append({
+                "source_url": source_article.url,
+                "similarity_score": similarity,
+                "summary": source_summary,
+                "domain": source_article.url.split('//')[-1].split('/')[0], # Simple domain extraction
+                "duplicate_urls": source_article.duplicate_urls
+            })
+
+        # The full text is no longer needed once vectorized and summarized
+        source_article.raw_text = ""
+    return supporting_articles_info, considered
+
+async def run_analysis(article_input: ArticleInput, plan: ExecutionPlan, reservation: GeminiReservation, profiler: MemoryProfiler):
     raw_text = await extract_content(article_input)
 
     # Check cache for raw_text
-    cached_result = get_cached_article(raw_text)
+    cached_result = get_cached_article(raw_text, article_input.dict())
     if cached_result:
         # For now, just return a dummy cached result. Full implementation later.
         # Return cached result directly to maintain consistent API response structure
         print("Returning cached result.")
         return cached_result
 
-    # NLP Preprocessing (Input)
-    preprocessed_text = preprocess_text(raw_text)
+    # Second-level cache: same words with different spacing or punctuation (no vector needed)
+    fingerprint_result = get_fingerprint_cached_article(raw_text, article_input.dict())
+    if fingerprint_result:
+        return fingerprint_result
 
-    # 1. Generate Summary & Claims (Stage 2)
-    # We use these to form a better search query
-    summary = generate_summary(raw_text)
-    claims = extract_claims(raw_text)
-    
-    # 2. Event & Entity Extraction (Pre-Stage 3)
-    # Extract event and entities for precise filtering
-    extraction_result = extract_event_and_entities(raw_text[:3000])
-    event_description = extraction_result.get("event", "")
-    required_entities = extraction_result.get("entities", [])
-    
-    print(f"Extracted Event: {event_description}")
-    print(f"Required Entities: {required_entities}")
-
-    # 3. Form Search Query (Stage 3)
-    # Use the extracted event description as the search query to be specific
-    if event_description:
-        search_query = event_description
-    else:
-        search_query = generate_search_query(raw_text[:2000])
+    # Blocking stages (NLP, LLM calls, scraping) run in worker threads so the event
+    # loop keeps accepting requests and the load planner sees the real concurrency.
+
+    with profiler.stage("input_vectorization"):
+        # NLP Preprocessing (Input)
+        preprocessed_text = await asyncio.to_thread(preprocess_text, raw_text)
+
+        # Vector Representation (Stage 4)
+        # Computed up front: it drives the fuzzy cache lookup and the ranking of search hits
+        input_vector = await asyncio.to_thread(get_text_vector, preprocessed_text)
+        # Cache vector
+        cache_vector(preprocessed_text, input_vector)
+        del preprocessed_text
+
+    # Third-level cache: near-identical submissions (trailing ads, OCR noise)
+    fuzzy_result = get_fuzzy_cached_article(raw_text, input_vector, article_input.dict())
+    if fuzzy_result:
+        print("Returning fuzzy cached result.")
+        return fuzzy_result
+
+    # Local corpus (Stage 3 without network I/O)
+    # Pre-ingested trusted articles are scored directly when they cover the story well enough,
+    # and are the only source in the local tier.
+    # Like the search path's entity hard filter, corpus matches must name most of the input's
+    # main entities (word by word, so "Modi on Monday" matches "Narendra Modi"), and same-topic
+    # coverage of a different event cannot vouch for it. Without recognizable entities the
+    # corpus cannot confirm the event and is not used.
+    corpus_entities = extract_proper_nouns(raw_text, CORPUS_ENTITY_COUNT)
+    corpus_articles = []
+    if corpus_entities:
+        with profiler.stage("corpus_search"):
+            corpus_articles = await asyncio.to_thread(search_local_corpus, input_vector)
+        corpus_articles = [
+            article for article in corpus_articles
+            if count_entity_mentions(article.raw_text, corpus_entities) * 2 > len(corpus_entities)
+        ]
+        print(f"Corpus matches naming {corpus_entities}: {len(corpus_articles)}")
+    corpus_support = sum(article.similarity >= SUPPORT_THRESHOLD for article in corpus_articles)
+    if corpus_support >= MIN_CORPUS_SUPPORT or not plan.network_sources:
+        # Answered from the corpus: the Gemini calls reserved for this request are not needed
+        reservation.release()
+        with profiler.stage("comparison"):
+            supporting_articles_info, considered = await asyncio.to_thread(compare_sources, corpus_articles, input_vector, plan, profiler)
+        credibility_score, explanation = calculate_credibility_score(supporting_articles_info, considered)
+        sources_truncated = considered < len(corpus_articles)
+        if sources_truncated:
+            explanation += truncation_note(considered, len(corpus_articles))
+        if not plan.network_sources and not corpus_articles:
+            explanation += " The service is under heavy load; please retry shortly for a full analysis."
+        result = {
+            "raw_input": article_input.dict(),
+            "extracted_text": raw_text,
+            "credibility_score": credibility_score,
+            "explanation": explanation,
+            "supporting_sources": supporting_articles_info,
+            "sources_truncated": sources_truncated,
+            "tier": plan.tier,
+            "source_collection": "corpus",
+            "disclaimer": DISCLAIMER
+        }
+        if plan.tier == TIER_FULL and corpus_articles and not sources_truncated:
+            cache_article(raw_text, result, input_vector)
+        return result
+
+    # The input summary and claims are served by /summarize; /analyze does not spend
+    # Gemini quota on them ahead of the event extraction that drives the search.
+
+    required_entities = []
+    search_query = ""
+    if plan.llm_query:
+        # 1. Event & Entity Extraction (Pre-Stage 3)
+        # Extract event and entities for precise filtering
+        extraction_result = await asyncio.to_thread(extract_event_and_entities, raw_text[:3000])
+        reservation.use()
+        event_description = extraction_result.get("event", "")
+        required_entities = extraction_result.get("entities", [])
+        
+        print(f"Extracted Event: {event_description}")
+        print(f"Required Entities: {required_entities}")
+
+        # 2. Form Search Query (Stage 3)
+        # Use the extracted event description as the search query to be specific
+        if event_description:
+            search_query = event_description
+        else:
+            search_query = await asyncio.to_thread(generate_search_query, raw_text[:2000])
+            reservation.use()
+    # The LLM stage is over; scraping and scoring make no Gemini calls
+    reservation.release()
+
+    if not search_query:
+        # Under load, or when the LLM stages failed: local keyword query and no entity hard filter.
+        # A full-tier request that got here is reported (and not cached) as reduced.
+        plan = downgrade(plan)
+        required_entities = []
+        search_query = " ".join(extract_keywords(raw_text))
         
     print(f"Generated Search Query: {search_query}")
     
-    # 4. Source Collection (Stage 3)
-    trusted_articles = await fetch_trusted_sources(search_query) 
+    # 3. Source Collection (Stage 3)
+    with profiler.stage("source_collection"):
+        trusted_articles = await fetch_trusted_sources(search_query, input_vector, required_entities, allow_advanced=plan.advanced_search)
     
-    # 5. Entity-Based Hard Filtering
+    # 4. Entity-Based Hard Filtering
     # Discard articles that do not contain ALL required entities to ensure relevance.
     # This step is critical to resolve the issue where irrelevant articles (e.g., same publisher but different topic)
     # were being fetched due to weak keyword matching. By enforcing the presence of core entities (Stage 4),
@@ -122,46 +310,22 @@ async def analyze_article(article_input: ArticleInput):
         filtered_articles = []
         for article in trusted_articles:
             # Check if ALL required entities are present in the article (case-insensitive)
-            article_text_lower = article.raw_text.lower()
-            if all(entity.lower() in article_text_lower for entity in required_entities):
+            if contains_entities(article.raw_text, required_entities):
                 filtered_articles.append(article)
         
         print(f"Filtered {len(trusted_articles)} -> {len(filtered_articles)} articles.")
         trusted_articles = filtered_articles 
 
-    # 4. Vector Representation (Stage 4)
-    input_vector = get_text_vector(preprocessed_text)
-    # Cache vector
-    cache_vector(preprocessed_text, input_vector)
-
-    supporting_articles_info = []
-    
     # 5. Comparison Loop
-    for source_article in trusted_articles:
-        # Preprocess source text
-        source_article.preprocessed_text = preprocess_text(source_article.raw_text)
-        
-        # Check cache or vectorize
-        source_vector = get_cached_vector(source_article.preprocessed_text)
-        if source_vector is None:
-            source_vector = get_text_vector(source_article.preprocessed_text)
-            cache_vector(source_article.preprocessed_text, source_vector)
-
-        # 6. Similarity Computation (Stage 5)
-        similarity = calculate_similarity(input_vector, source_vector)
-
-        if similarity >= 0.4: # Threshold
-            # Generate summary for the source article for the UI
-            source_summary = generate_summary(source_article.raw_text)
-            supporting_articles_info.append({
-                "source_url": source_article.url,
-                "similarity_score": similarity,
-                "summary": source_summary,
-                "domain": source_article.url.split('//')[-1].split('/')[0] # Simple domain extraction
-            })
+    with profiler.stage("comparison"):
+        supporting_articles_info, considered = await asyncio.to_thread(compare_sources, trusted_articles, input_vector, plan, profiler)
     
     # Credibility Scoring
-    credibility_score, explanation = calculate_credibility_score(supporting_articles_info, len(trusted_articles))
+    # Each near-duplicate cluster counts once, so syndicated copies do not inflate the score
+    credibility_score, explanation = calculate_credibility_score(supporting_articles_info, considered)
+    sources_truncated = considered < len(trusted_articles)
+    if sources_truncated:
+        explanation += truncation_note(considered, len(trusted_articles))
 
     # Cache the full result for raw_text
     full_result = {
@@ -170,9 +334,14 @@ async def analyze_article(article_input: ArticleInput):
         "credibility_score": credibility_score,
         "explanation": explanation,
         "supporting_sources": supporting_articles_info,
-        "disclaimer": "This is an assistive tool, not a final authority on truth. Users must cross-check information independently."
+        "sources_truncated": sources_truncated,
+        "tier": plan.tier,
+        "source_collection": "search",
+        "disclaimer": DISCLAIMER
     }
-    cache_article(raw_text, full_result)
+    # Reduced-tier and budget-truncated verdicts are not cached so a later full analysis can replace them
+    if plan.tier == TIER_FULL and not sources_truncated:
+        cache_article(raw_text, full_result, input_vector)
 
     return full_result
 
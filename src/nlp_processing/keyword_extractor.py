@@ -0,0 +1,82 @@
+import re
+from collections import Counter
+from typing import List
+
+from .text_preprocessor import preprocess_text
+
+# Runs of capitalized words (e.g. "United Nations", "Narendra Modi") are usually named entities.
+# Hyphenated compounds ("Secretary-General") are one word, and a run never spans a line break.
+_PROPER_NOUN_PHRASE = re.compile(r"\b[A-Z][a-zA-Z]+(?:-[A-Za-z]+)*(?:[ \t]+[A-Z][a-zA-Z]+(?:-[A-Za-z]+)*)*\b")
+
+# Capitalized only because they start a phrase ("On Monday...", "The Indian Army")
+_LEADING_FUNCTION_WORDS = {
+    "the", "a", "an", "on", "in", "at", "by", "for", "from", "with", "of", "to", "as",
+    "after", "before", "during", "while", "when", "but", "and", "or", "this", "that", "these", "those",
+}
+# Dates are not entities; they split a run ("Monday Prime Minister" -> "Prime Minister")
+_DATE_WORDS = {
+    "monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday",
+    "january", "february", "march", "april", "may", "june", "july", "august",
+    "september", "october", "november", "december",
+}
+# Wire-agency bylines that open syndicated reports
+_AGENCY_TAGS = {"PTI", "ANI", "IANS", "UNI", "AFP", "AP", "REUTERS"}
+
+def _entity_segments(phrase: str, at_line_start: bool) -> List[str]:
+    """Splits a capitalized run into entity phrases, dropping dates, datelines and leading function words."""
+    words = phrase.split()
+    # All-caps runs are datelines ("NEW DELHI") or agency tags ("PTI"), except short acronyms mid-sentence
+    if all(word.isupper() for word in words) and (len(words) > 1 or at_line_start or phrase in _AGENCY_TAGS):
+        return []
+
+    segments, current = [], []
+    for word in words + [None]:
+        if word is None or word.lower() in _DATE_WORDS or word in _AGENCY_TAGS:
+            while current and current[0].lower() in _LEADING_FUNCTION_WORDS:
+                current.pop(0)
+            if current:
+                segments.append(" ".join(current))
+            current = []
+        else:
+            current.append(word)
+    return segments
+
+def extract_proper_nouns(text: str, max_phrases: int = 4) -> List[str]:
+    """Returns the most frequent proper-noun phrases (likely named entities) in the text."""
+    if not text:
+        return []
+
+    phrases = Counter()
+    for match in _PROPER_NOUN_PHRASE.finditer(text):
+        start = match.start()
+        preceding = text[max(0, start - 2):start]
+        at_line_start = start == 0 or "\n" in preceding
+        sentence_start = at_line_start or preceding.strip() in {".", "!", "?"}
+        for phrase in _entity_segments(match.group(0), at_line_start):
+            # Skip single capitalized words that just start a sentence
+            if " " not in phrase and sentence_start and match.group(0).startswith(phrase):
+                continue
+            phrases[phrase] += 1
+
+    return [phrase for phrase, _ in phrases.most_common(max_phrases)]
+
+def extract_keywords(text: str, max_keywords: int = 8) -> List[str]:
+    """
+    Extracts search keywords locally (no LLM): the most frequent proper-noun
+    phrases first, then the most frequent remaining content words.
+    """
+    if not text:
+        return []
+
+    keywords = extract_proper_nouns(text, max_keywords // 2)
+    seen = set(" ".join(keywords).lower().split())
+
+    words = Counter(word for word in preprocess_text(text).split() if len(word) > 2 and not word.isdigit())
+    for word, _ in words.most_common():
+        if len(keywords) >= max_keywords:
+            break
+        if word not in seen:
+            keywords.append(word)
+            seen.add(word)
+
+    return keywords
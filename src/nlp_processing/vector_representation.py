@@ -15,3 +15,15 @@ def get_text_vector(text: str):
     # Generate embedding
     embedding = model.encode(text)
     return embedding
+
+def get_text_vectors(texts: list[str]) -> np.ndarray:
+    """Converts a batch of texts into vectors in a single Sentence-BERT call."""
+    if not texts:
+        return np.zeros((0, 384))
+
+    # Encode non-empty texts together; empty ones keep a zero vector
+    vectors = np.zeros((len(texts), 384))
+    indices = [i for i, text in enumerate(texts) if text]
+    if indices:
+        vectors[indices] = model.encode([texts[i] for i in indices])
+    return vectors
@@ -0,0 +1,75 @@
+import os
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, List
+
+# Opt-in allocation tracking for /analyze. tracemalloc slows Python allocations
+# noticeably, so it only runs when PROFILE_MEMORY=1. Numbers are process-wide:
+# profile with a single request in flight for clean per-request figures.
+PROFILE_MEMORY = os.getenv("PROFILE_MEMORY", "0") == "1"
+# Per-request allocation budget in MB (0 disables); only enforced while profiling.
+# Measured process-wide, so concurrent requests count toward each other's budget;
+# verdicts cut short by it are flagged and never cached.
+MEMORY_BUDGET_MB = float(os.getenv("MEMORY_BUDGET_MB", "0"))
+TOP_ALLOCATIONS = 5
+
+_MB = 1024 * 1024
+
+class MemoryProfiler:
+    """Takes tracemalloc snapshots around each pipeline stage of one request."""
+
+    def __init__(self, enabled: bool = PROFILE_MEMORY, budget_mb: float = MEMORY_BUDGET_MB):
+        self.enabled = enabled
+        self.budget_mb = budget_mb
+        self.stages: List[Dict[str, Any]] = []
+        self._baseline = 0
+        if enabled:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            self._baseline = tracemalloc.get_traced_memory()[0]
+
+    @contextmanager
+    def stage(self, name: str):
+        """Records net and peak allocation of the enclosed stage plus its top allocation sites."""
+        if not self.enabled:
+            yield
+            return
+
+        before = tracemalloc.take_snapshot()
+        start_current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            top = after.compare_to(before, "lineno")[:TOP_ALLOCATIONS]
+            self.stages.append({
+                "stage": name,
+                "net_mb": round((current - start_current) / _MB, 3),
+                "peak_mb": round((peak - start_current) / _MB, 3),
+                "top_allocations": [
+                    f"{stat.traceback[0].filename}:{stat.traceback[0].lineno} {stat.size_diff / 1024:+.1f} KiB"
+                    for stat in top
+                ]
+            })
+
+    @property
+    def allocated_mb(self) -> float:
+        """Memory allocated since the request started and still held."""
+        if not self.enabled:
+            return 0.0
+        return (tracemalloc.get_traced_memory()[0] - self._baseline) / _MB
+
+    def over_budget(self) -> bool:
+        return self.enabled and self.budget_mb > 0 and self.allocated_mb > self.budget_mb
+
+    def report(self) -> Dict[str, Any]:
+        report = {
+            "allocated_mb": round(self.allocated_mb, 3),
+            "budget_mb": self.budget_mb or None,
+            "stages": self.stages
+        }
+        for stage in self.stages:
+            print(f"Memory [{stage['stage']}]: net {stage['net_mb']} MB, peak {stage['peak_mb']} MB")
+        return report
@@ -0,0 +1,282 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Optional
+
+# HTTP statuses worth retrying: timeouts, throttling and transient server errors
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+# Statuses that mean the provider will not serve us until something changes (bad key, no access)
+FATAL_STATUS_CODES = {401, 403}
+
+# Provider SDK exceptions that carry no status code
+QUOTA_ERROR_NAMES = {"UsageLimitExceededError"}
+FATAL_ERROR_NAMES = {"InvalidAPIKeyError", "MissingAPIKeyError", "ForbiddenError"}
+
+# Worker threads for hedged calls; sized well above the request concurrency the planner admits
+HEDGE_WORKERS = 32
+
+class ProviderUnavailableError(Exception):
+    """Raised without calling the provider when its circuit is open or its rate limit is exhausted."""
+
+def _status_code(exc: Exception) -> Optional[int]:
+    """Extracts an HTTP status code from the exception types raised by the provider SDKs."""
+    for attr in ("code", "status_code"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    value = getattr(getattr(exc, "response", None), "status_code", None)
+    return value if isinstance(value, int) else None
+
+def is_quota_exhausted(exc: Exception) -> bool:
+    """True when the provider reports that our quota is used up (retrying cannot help)."""
+    if type(exc).__name__ in QUOTA_ERROR_NAMES:
+        return True
+    message = str(exc).lower()
+    return _status_code(exc) == 429 and ("quota" in message or "resource_exhausted" in message)
+
+def is_fatal(exc: Exception) -> bool:
+    """True for authentication/authorization failures that affect every request."""
+    return type(exc).__name__ in FATAL_ERROR_NAMES or _status_code(exc) in FATAL_STATUS_CODES
+
+def is_retryable(exc: Exception) -> bool:
+    """True for transient failures: throttling, server errors, timeouts and dropped connections."""
+    if is_quota_exhausted(exc) or is_fatal(exc):
+        return False
+    status = _status_code(exc)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    # httpx/requests/urllib3 transport errors do not share a base class; match on the class hierarchy names
+    names = [cls.__name__ for cls in type(exc).__mro__]
+    return any("Timeout" in name or "Connect" in name for name in names)
+
+class TokenBucket:
+    """Client-side rate limiter refilling at `rate_per_minute`, allowing bursts up to `capacity`."""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else max(1.0, rate_per_minute / 6.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def available_tokens(self) -> float:
+        """Tokens that could be taken right now without waiting."""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def acquire(self, max_wait: float = 0.0) -> bool:
+        """Takes one token, waiting at most `max_wait` seconds. Returns False if none became available."""
+        deadline = time.monotonic() + max_wait
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait_time = (1 - self._tokens) / self.rate
+            if time.monotonic() + wait_time > deadline:
+                return False
+            time.sleep(wait_time)
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and rejects calls for
+    `recovery_timeout` seconds; then lets one trial call through (half-open).
+    The trial must end in record_success, record_failure or release_trial; a trial
+    that reports nothing within `trial_timeout` seconds is replaced by a new one.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, recovery_timeout: float = 60.0, trial_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.trial_timeout = trial_timeout
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_started = 0.0
+        self._state = self.CLOSED
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    @property
+    def available(self) -> bool:
+        """True when a call would be let through right now (closed, or a trial slot is free)."""
+        with self._lock:
+            return self._can_pass(time.monotonic())
+
+    def _can_pass(self, now: float) -> bool:
+        if self._state == self.CLOSED:
+            return True
+        if self._state == self.OPEN:
+            return now - self._opened_at >= self.recovery_timeout
+        # Half-open: only when the running trial has gone silent for too long
+        return now - self._trial_started >= self.trial_timeout
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if not self._can_pass(now):
+                return False
+            if self._state != self.CLOSED:
+                # Let exactly one trial request through
+                self._state = self.HALF_OPEN
+                self._trial_started = now
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._state = self.CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._open(time.monotonic())
+
+    def release_trial(self):
+        """Ends a trial that never reached the provider; the next call may try again at once."""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._state = self.OPEN
+                # Keep the recovery window already served
+                self._opened_at = time.monotonic() - self.recovery_timeout
+
+    def trip(self):
+        """Opens the circuit immediately (e.g. quota exhausted)."""
+        with self._lock:
+            self._open(time.monotonic())
+
+    def _open(self, now: float):
+        self._state = self.OPEN
+        self._opened_at = now
+
+class ProviderGuard:
+    """
+    Resilience layer around a remote provider (Gemini, Tavily): rate limiting,
+    circuit breaking, retries on retryable errors only, and optional hedged requests.
+    Callers keep their own fallbacks; this only makes failures fast.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: float,
+        failure_threshold: int = 3,
+        recovery_timeout: float = 60.0,
+        max_attempts: int = 3,
+        base_backoff: float = 0.5,
+        max_backoff: float = 4.0,
+        max_rate_wait: float = 5.0,
+        hedge_after: Optional[float] = None,
+    ):
+        self.name = name
+        self.bucket = TokenBucket(requests_per_minute)
+        self.breaker = CircuitBreaker(failure_threshold, recovery_timeout)
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.max_rate_wait = max_rate_wait
+        self.hedge_after = hedge_after
+        self._executor = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix=f"{name}-hedge") if hedge_after else None
+        self._running = 0
+        self._running_lock = threading.Lock()
+
+    @property
+    def healthy(self) -> bool:
+        """True when the guard would let a call through now (circuit closed or a trial is due)."""
+        return self.breaker.available
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Calls `func` under the guard. Raises ProviderUnavailableError when failing fast."""
+        if not self.breaker.allow_request():
+            raise ProviderUnavailableError(f"{self.name} circuit is open; skipping call.")
+
+        # Every exit below closes, reopens or releases the breaker so a half-open trial always resolves
+        for attempt in range(1, self.max_attempts + 1):
+            if not self.bucket.acquire(self.max_rate_wait):
+                self.breaker.release_trial()
+                raise ProviderUnavailableError(f"{self.name} client-side rate limit reached.")
+            try:
+                result = self._invoke(func, *args, **kwargs)
+            except Exception as e:
+                if is_quota_exhausted(e) or is_fatal(e):
+                    print(f"{self.name} unavailable ({type(e).__name__}); opening circuit.")
+                    self.breaker.trip()
+                    raise
+                if not is_retryable(e):
+                    if _status_code(e) is not None:
+                        # The provider answered (e.g. 400), so it is reachable
+                        self.breaker.record_success()
+                    else:
+                        # Failed before reaching the provider; says nothing about its health
+                        self.breaker.release_trial()
+                    raise
+                self.breaker.record_failure()
+                if attempt == self.max_attempts or not self.breaker.allow_request():
+                    raise
+                delay = min(self.max_backoff, self.base_backoff * 2 ** (attempt - 1))
+                delay *= random.uniform(0.5, 1.0) # Jitter so concurrent requests do not retry in lockstep
+                print(f"{self.name} attempt {attempt} failed ({e}); retrying in {delay:.1f}s.")
+                time.sleep(delay)
+            else:
+                self.breaker.record_success()
+                return result
+
+    def _run_tracked(self, started: threading.Event, func: Callable[..., Any], *args, **kwargs) -> Any:
+        with self._running_lock:
+            self._running += 1
+        started.set()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._running_lock:
+                self._running -= 1
+
+    def _invoke(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Runs the call; if hedging is enabled and it is slow, races a second identical request."""
+        if not self._executor:
+            return func(*args, **kwargs)
+
+        started = threading.Event()
+        primary = self._executor.submit(self._run_tracked, started, func, *args, **kwargs)
+        # The hedge timer starts when the call actually runs, not while it waits for a worker
+        started.wait()
+        done, _ = wait([primary], timeout=self.hedge_after)
+        if done:
+            return primary.result()
+
+        # Only hedge when a worker is free and a spare token is available right now; never wait for either
+        with self._running_lock:
+            pool_busy = self._running >= HEDGE_WORKERS
+        if pool_busy or not self.bucket.acquire(0.0):
+            return primary.result()
+
+        print(f"{self.name} call slower than {self.hedge_after}s; sending hedged request.")
+        pending = {primary, self._executor.submit(self._run_tracked, threading.Event(), func, *args, **kwargs)}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        raise error
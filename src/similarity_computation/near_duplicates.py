@@ -0,0 +1,90 @@
+import unicodedata
+import zlib
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+# MinHash over word shingles with LSH banding. 16 bands x 8 rows puts the
+# LSH candidate threshold near a Jaccard similarity of 0.7; candidates are then
+# confirmed against DUPLICATE_THRESHOLD using the full signatures.
+SHINGLE_SIZE = 5
+NUM_PERMUTATIONS = 128
+NUM_BANDS = 16
+DUPLICATE_THRESHOLD = 0.7
+
+# Universal hashing (a * x + b) mod p with p = 2^31 - 1 keeps every product inside uint64
+_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.RandomState(42)
+_A = _rng.randint(1, (1 << 31) - 1, size=NUM_PERMUTATIONS).astype(np.uint64)
+_B = _rng.randint(0, (1 << 31) - 1, size=NUM_PERMUTATIONS).astype(np.uint64)
+
+def words(text: str) -> List[str]:
+    """
+    Lowercase words in any script. Letters, digits and combining marks (e.g. Devanagari
+    vowel signs, which a regex \\w does not match) form words; everything else separates them.
+    """
+    return "".join(ch if unicodedata.category(ch)[0] in "LMN" else " " for ch in text.lower()).split()
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    """Splits text into overlapping word n-grams (case and punctuation insensitive)."""
+    tokens = words(text)
+    if len(tokens) < size:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+def minhash_signature(text: str) -> Optional[np.ndarray]:
+    """Computes the MinHash signature of a text, or None if it has no words."""
+    shingle_set = shingles(text)
+    if not shingle_set:
+        return None
+    hashes = np.array([zlib.crc32(s.encode("utf-8")) for s in shingle_set], dtype=np.uint64) % _PRIME
+    # One row per permutation, minimum over all shingles
+    permuted = (np.outer(_A, hashes) + _B[:, None]) % _PRIME
+    return permuted.min(axis=1)
+
+def estimate_similarity(signature1: np.ndarray, signature2: np.ndarray) -> float:
+    """Estimates the Jaccard similarity of two texts from their MinHash signatures."""
+    return float(np.mean(signature1 == signature2))
+
+class NearDuplicateIndex:
+    """Clusters texts as they arrive; each new text either joins an existing cluster or starts one."""
+
+    def __init__(self, threshold: float = DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+        self._rows = NUM_PERMUTATIONS // NUM_BANDS
+        self._buckets: Dict[Tuple[int, bytes], List[str]] = {}
+        self._signatures: Dict[str, np.ndarray] = {}
+
+    def _bands(self, signature: np.ndarray):
+        for band in range(NUM_BANDS):
+            yield band, signature[band * self._rows:(band + 1) * self._rows].tobytes()
+
+    def find(self, signature: np.ndarray) -> Optional[Tuple[str, float]]:
+        """Returns the best matching cluster key and its estimated similarity, if above threshold."""
+        candidates = set()
+        for bucket in self._bands(signature):
+            candidates.update(self._buckets.get(bucket, []))
+
+        best = None
+        for key in candidates:
+            similarity = estimate_similarity(signature, self._signatures[key])
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (key, similarity)
+        return best
+
+    def add(self, key: str, text: str) -> Optional[str]:
+        """
+        Adds a text under `key`. Returns the key of the cluster it duplicates,
+        or None if it is new (it then becomes the representative of its own cluster).
+        """
+        signature = minhash_signature(text)
+        if signature is None:
+            return None
+
+        match = self.find(signature)
+        if match:
+            return match[0]
+
+        self._signatures[key] = signature
+        for bucket in self._bands(signature):
+            self._buckets.setdefault(bucket, []).append(key)
+        return None
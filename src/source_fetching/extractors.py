@@ -0,0 +1,119 @@
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+from lxml import html as lxml_html
+
+# Site-specific extractors for the trusted domains. Each extractor receives the
+# parsed lxml tree and returns the article body text, or None if the page does
+# not look like an article it understands (the caller then falls back to newspaper3k).
+Extractor = Callable[[lxml_html.HtmlElement], Optional[str]]
+
+_EXTRACTORS: Dict[str, Extractor] = {}
+
+# Minimum length for a fast extraction to be trusted (matches the scraper's validation)
+MIN_TEXT_LENGTH = 100
+
+# Containers that hold the article body on most news pages
+_GENERIC_BODY_XPATHS = [
+    "//*[@itemprop='articleBody']",
+    "//article",
+]
+
+def register_extractor(*domains: str):
+    """Decorator that registers an extractor for one or more domains."""
+    def decorator(func: Extractor) -> Extractor:
+        for domain in domains:
+            _EXTRACTORS[domain] = func
+        return func
+    return decorator
+
+def get_extractor(url: str) -> Optional[Extractor]:
+    """Finds the extractor for a URL, preferring the most specific domain (news.un.org over un.org)."""
+    host = (urlparse(url).hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+
+    parts = host.split(".")
+    for i in range(len(parts) - 1):
+        extractor = _EXTRACTORS.get(".".join(parts[i:]))
+        if extractor:
+            return extractor
+    return None
+
+def extract_text(url: str, html: str) -> Optional[str]:
+    """Extracts article text with the registered fast extractor for the URL's domain."""
+    extractor = get_extractor(url)
+    if not extractor or not html:
+        return None
+
+    try:
+        tree = lxml_html.document_fromstring(html)
+    except Exception as e:
+        print(f"Error parsing HTML for {url}: {e}")
+        return None
+
+    # Scripts, styles and navigation never contain article text
+    for element in tree.xpath("//script | //style | //noscript | //nav | //header | //footer | //aside"):
+        element.drop_tree()
+
+    text = extractor(tree)
+    if not text or len(text.strip()) < MIN_TEXT_LENGTH:
+        return None
+    return text
+
+def _paragraphs(tree: lxml_html.HtmlElement, xpaths: List[str]) -> Optional[str]:
+    """Joins the <p> texts of the first matching container that yields enough text."""
+    for xpath in xpaths + _GENERIC_BODY_XPATHS:
+        for container in tree.xpath(xpath):
+            paragraphs = [" ".join(p.text_content().split()) for p in container.iter("p")]
+            text = "\n\n".join(p for p in paragraphs if p)
+            if len(text) >= MIN_TEXT_LENGTH:
+                return text
+    return None
+
+@register_extractor("ptinews.com")
+def _extract_pti(tree: lxml_html.HtmlElement) -> Optional[str]:
+    return _paragraphs(tree, [
+        "//div[contains(@class, 'storydetails')]",
+        "//div[contains(@class, 'story-details')]",
+    ])
+
+@register_extractor("aninews.in")
+def _extract_ani(tree: lxml_html.HtmlElement) -> Optional[str]:
+    return _paragraphs(tree, [
+        "//div[contains(@class, 'content') and contains(@class, 'count')]",
+        "//div[contains(@class, 'article-content')]",
+    ])
+
+@register_extractor("pib.gov.in")
+def _extract_pib(tree: lxml_html.HtmlElement) -> Optional[str]:
+    # PIB press releases often use bare divs/spans instead of <p>, so fall back to the container text
+    for container in tree.xpath("//div[contains(@class, 'innner-page-main-about-us-content-right-part')]"):
+        text = _paragraphs(container, [".//div[contains(@class, 'ReleaseText')]", "."])
+        if text:
+            return text
+        text = "\n".join(line.strip() for line in container.text_content().splitlines() if line.strip())
+        if len(text) >= MIN_TEXT_LENGTH:
+            return text
+    return _paragraphs(tree, [])
+
+@register_extractor("ddnews.gov.in")
+def _extract_dd(tree: lxml_html.HtmlElement) -> Optional[str]:
+    return _paragraphs(tree, [
+        "//div[contains(@class, 'entry-content')]",
+        "//div[contains(@class, 'news-content')]",
+    ])
+
+@register_extractor("news.un.org")
+def _extract_un_news(tree: lxml_html.HtmlElement) -> Optional[str]:
+    return _paragraphs(tree, [
+        "//div[contains(@class, 'field--name-field-text-column')]",
+        "//div[contains(@class, 'text-formatted')]",
+    ])
+
+@register_extractor("un.org")
+def _extract_un(tree: lxml_html.HtmlElement) -> Optional[str]:
+    return _paragraphs(tree, [
+        "//div[contains(@class, 'field--name-body')]",
+        "//main",
+        "//div[@id='content']",
+    ])
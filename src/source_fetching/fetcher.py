@@ -1,21 +1,30 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 
 class SourceArticle(BaseModel):
     url: str
-    raw_text: str
-    preprocessed_text: str # This would be populated after NLP preprocessing
+    raw_text: str # Released once the article has been vectorized and summarized
+    duplicate_urls: List[str] = [] # Syndicated near-copies folded into this article
+    similarity: Optional[float] = None # Precomputed input similarity (local corpus matches)
 
 import os
+import re
+import asyncio
+import numpy as np
 from tavily import TavilyClient
 from dotenv import load_dotenv
 
+from ..resilience.guard import ProviderGuard
+
 load_dotenv()
 
 # Initialize Tavily Client
 tavily_api_key = os.getenv("TAVILY_API_KEY")
 tavily_client = TavilyClient(api_key=tavily_api_key) if tavily_api_key else None
 
+# Shared resilience layer: rate limit matched to the Tavily plan, fail fast while unhealthy
+tavily_guard = ProviderGuard("tavily", requests_per_minute=float(os.getenv("TAVILY_RPM", "60")))
+
 # List of specific high-credibility news domains as per user requirement
 # Includes Press Trust of India (PTI), ANI, PIB, DD, and UN
 TRUSTED_DOMAINS = [
@@ -27,51 +36,194 @@ TRUSTED_DOMAINS = [
     "news.un.org"       # UN News Service
 ]
 
+# Adaptive discovery: start with a cheap basic search and only widen to an
+# advanced search when too few scraped sources pass the entity filter.
+BASIC_SEARCH_RESULTS = 10
+ADVANCED_SEARCH_RESULTS = 20
+MAX_SCRAPES_PER_SEARCH = 6
+MIN_PASSING_SOURCES = 3
+
+# Local corpus lookup: nearest pre-ingested articles above a relevance floor
+CORPUS_TOP_K = 20
+CORPUS_MIN_SIMILARITY = 0.3
+
+# Weight of snippet/input similarity vs. entity coverage when ranking hits
+SNIPPET_SIMILARITY_WEIGHT = 0.7
+
 from .scraper import fetch_article
+from ..nlp_processing.text_preprocessor import preprocess_text
+from ..nlp_processing.vector_representation import get_text_vectors
+from ..similarity_computation.calculator import calculate_similarity
+from ..similarity_computation.near_duplicates import NearDuplicateIndex
+from ..database.corpus import trusted_corpus
+
+def contains_entities(text: str, entities: List[str]) -> bool:
+    """Checks whether ALL entities appear in the text (case-insensitive)."""
+    # Case-insensitive search avoids building a lowercased copy of every article
+    return all(re.search(re.escape(entity), text, re.IGNORECASE) for entity in entities)
+
+def count_entity_mentions(text: str, entities: List[str]) -> int:
+    """Counts the entities whose words all appear in the text (case-insensitive, in any order or form of address)."""
+    return sum(
+        all(re.search(rf"\b{re.escape(word)}\b", text, re.IGNORECASE) for word in entity.split())
+        for entity in entities
+    )
+
+def _search(query: str, search_depth: str, max_results: int) -> List[dict]:
+    """Runs a single Tavily search restricted to the trusted domains."""
+    print(f"Tavily search ({search_depth}, max_results={max_results})")
+    response = tavily_guard.call(
+        tavily_client.search,
+        query=query,
+        search_depth=search_depth,
+        topic="news",
+        max_results=max_results,
+        include_domains=TRUSTED_DOMAINS
+    )
+    return [result for result in response.get("results", []) if result.get("url")]
+
+def _rank_results(results: List[dict], input_vector: Optional[np.ndarray], required_entities: List[str]) -> List[dict]:
+    """Orders search hits by how well their snippets match the input article.
+
+    Each snippet (title + content) is scored by its embedding similarity to the
+    input vector and by the fraction of required entities it mentions, so only
+    the most promising hits get scraped.
+    """
+    if not results:
+        return []
+
+    snippets = [f"{r.get('title', '')} {r.get('content', '')}" for r in results]
+
+    similarities = [0.0] * len(results)
+    if input_vector is not None:
+        snippet_vectors = get_text_vectors([preprocess_text(s) for s in snippets])
+        similarities = [calculate_similarity(input_vector, v) for v in snippet_vectors]
+
+    ranked = []
+    for result, snippet, similarity in zip(results, snippets, similarities):
+        if required_entities:
+            snippet_lower = snippet.lower()
+            coverage = sum(e.lower() in snippet_lower for e in required_entities) / len(required_entities)
+        else:
+            coverage = 1.0
+        score = SNIPPET_SIMILARITY_WEIGHT * similarity + (1 - SNIPPET_SIMILARITY_WEIGHT) * coverage
+        # Tavily's own relevance score only breaks ties
+        ranked.append((score, result.get("score", 0.0), result))
+
+    ranked.sort(key=lambda item: (item[0], item[1]), reverse=True)
+    return [result for _, _, result in ranked]
+
+async def _scrape(results: List[dict], seen_urls: set, duplicate_index: NearDuplicateIndex, articles_by_url: dict) -> List[SourceArticle]:
+    """Scrapes the top ranked hits that were not already fetched.
+
+    Candidates are scraped concurrently (the pooled HTTP client is thread-safe).
+    Syndicated copies (e.g. the same PTI wire story on several sites) are then
+    detected in rank order and folded into the first article of their cluster
+    instead of being returned separately.
+    """
+    candidates = []
+    for result in results:
+        if len(candidates) >= MAX_SCRAPES_PER_SEARCH:
+            break
+        url = result["url"]
+        if url in seen_urls:
+            continue
+        seen_urls.add(url)
+        print(f"Scraping source: {url}")
+        candidates.append(url)
+
+    # Use the safe fetch function with proper encoding handling
+    # If one source fails, fetch_article returns None, and we skip it.
+    contents = await asyncio.gather(*(asyncio.to_thread(fetch_article, url) for url in candidates))
 
-async def fetch_trusted_sources(query: str, num_results: int = 50) -> List[SourceArticle]:
-    """Fetches articles from trusted sources using Tavily API for discovery and safe scraper for content."""
+    articles = []
+    for url, content in zip(candidates, contents):
+        if not content:
+            print(f"Skipping {url} due to fetch failure.")
+            continue
+
+        duplicate_of = duplicate_index.add(url, content)
+        if duplicate_of:
+            print(f"{url} is a near-duplicate of {duplicate_of}")
+            articles_by_url[duplicate_of].duplicate_urls.append(url)
+            continue
+
+        article = SourceArticle(
+            url=url,
+            raw_text=content
+        )
+        articles_by_url[url] = article
+        articles.append(article)
+    return articles
+
+async def fetch_trusted_sources(query: str, input_vector: Optional[np.ndarray] = None, required_entities: Optional[List[str]] = None, allow_advanced: bool = True) -> List[SourceArticle]:
+    """Fetches articles from trusted sources using Tavily API for discovery and safe scraper for content.
+
+    Discovery is adaptive: a basic search is ranked against the input vector and
+    required entities and only the top hits are scraped. An advanced search is
+    issued only when fewer than MIN_PASSING_SOURCES scraped articles contain all
+    required entities (and `allow_advanced` is set, which the load planner clears
+    under pressure). Near-duplicate articles are returned once per cluster.
+    """
     if not tavily_client:
         print("Tavily API key not found.")
         return []
 
+    required_entities = required_entities or []
+
     try:
         print(f"Fetching trusted sources for query: {query}")
     except UnicodeEncodeError:
         print(f"Fetching trusted sources for query: {query.encode('utf-8', errors='replace')}")
     
-    try:
-        # Search using Tavily to find relevant URLs from trusted domains
-        response = tavily_client.search(
-            query=query, 
-            search_depth="advanced", 
-            topic="news", 
-            max_results=num_results,
-            include_domains=TRUSTED_DOMAINS
+    articles = []
+    seen_urls = set()
+    duplicate_index = NearDuplicateIndex()
+    articles_by_url = {}
+
+    searches = [("basic", BASIC_SEARCH_RESULTS)]
+    if allow_advanced:
+        searches.append(("advanced", ADVANCED_SEARCH_RESULTS))
+
+    for search_depth, max_results in searches:
+        try:
+            results = await asyncio.to_thread(_search, query, search_depth, max_results)
+        except Exception as e:
+            print(f"Error fetching sources with Tavily ({search_depth}): {e}")
+            break
+
+        ranked = await asyncio.to_thread(_rank_results, results, input_vector, required_entities)
+        articles.extend(await _scrape(ranked, seen_urls, duplicate_index, articles_by_url))
+
+        passing = sum(contains_entities(a.raw_text, required_entities) for a in articles)
+        print(f"{passing} of {len(articles)} scraped sources pass after {search_depth} search.")
+        if passing >= MIN_PASSING_SOURCES:
+            break
+
+    return articles
+
+def search_local_corpus(input_vector: np.ndarray) -> List[SourceArticle]:
+    """Finds related articles in the pre-ingested trusted corpus (no network I/O).
+
+    Matches carry their similarity to the input, so they need no re-vectorization,
+    and syndicated copies are clustered just like scraped sources.
+    """
+    duplicate_index = NearDuplicateIndex()
+    articles_by_url = {}
+    articles = []
+    for entry, similarity in trusted_corpus.search(input_vector, CORPUS_TOP_K, CORPUS_MIN_SIMILARITY):
+        duplicate_of = duplicate_index.add(entry["url"], entry["text"])
+        if duplicate_of:
+            articles_by_url[duplicate_of].duplicate_urls.append(entry["url"])
+            continue
+
+        article = SourceArticle(
+            url=entry["url"],
+            raw_text=entry["text"],
+            similarity=similarity
         )
-        
-        articles = []
-        for result in response.get("results", []):
-            url = result.get("url")
-            if not url:
-                continue
-                
-            # Use the safe fetch function with proper encoding handling
-            # If one source fails, fetch_article returns None, and we skip it.
-            print(f"Scraping source: {url}")
-            content = fetch_article(url)
-            
-            if content:
-                articles.append(SourceArticle(
-                    url=url,
-                    raw_text=content,
-                    preprocessed_text="" # To be processed later
-                ))
-            else:
-                print(f"Skipping {url} due to fetch failure.")
-            
-        return articles
-
-    except Exception as e:
-        print(f"Error fetching sources with Tavily: {e}")
-        return []
+        articles_by_url[entry["url"]] = article
+        articles.append(article)
+
+    print(f"Local corpus: {len(articles)} related articles.")
+    return articles
@@ -0,0 +1,131 @@
+import re
+import time
+import httpx
+from typing import Optional, Tuple
+
+# HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 keep-alive without it
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# Separate deadlines: connecting should be quick, reads may be slower, and the
+# whole body must arrive within TOTAL_DEADLINE so a trickling page cannot hold a worker.
+CONNECT_TIMEOUT = 5.0
+READ_TIMEOUT = 10.0
+TOTAL_DEADLINE = 20.0
+
+# Largest body we are willing to read; news pages are far below this
+MAX_RESPONSE_BYTES = 5 * 1024 * 1024
+
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+# How far into a body we look for a <meta> charset or a content-type signature
+SNIFF_BYTES = 2048
+# Legacy pages without a usable charset are usually Windows-1252 when they are not UTF-8
+FALLBACK_ENCODING = "cp1252"
+
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([a-z0-9_.:-]+)""", re.IGNORECASE)
+
+class FetchError(Exception):
+    """Raised when an outbound fetch fails or its response is rejected."""
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+# Shared pooled client used for every outbound page fetch (user URLs and trusted sources)
+_client = httpx.Client(
+    http2=HTTP2_AVAILABLE,
+    follow_redirects=True,
+    timeout=httpx.Timeout(connect=CONNECT_TIMEOUT, read=READ_TIMEOUT, write=READ_TIMEOUT, pool=CONNECT_TIMEOUT),
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=30.0),
+    headers={
+        "User-Agent": USER_AGENT,
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    },
+)
+
+def sniff_content_type(head: bytes) -> str:
+    """Guesses a media type from the start of a body served without Content-Type ("" if unknown)."""
+    head = head[:SNIFF_BYTES].lstrip(b"\xef\xbb\xbf \t\r\n").lower()
+    if head.startswith(b"%pdf"):
+        return "application/pdf"
+    if any(tag in head for tag in (b"<rss", b"<feed", b"<urlset", b"<sitemapindex")):
+        return "application/xml"
+    if head.startswith(b"<!doctype html") or b"<html" in head:
+        return "text/html"
+    if head.startswith(b"<?xml"):
+        return "application/xml"
+    return ""
+
+def fetch_bytes(url: str, allowed_content_types: Tuple[str, ...] = HTML_CONTENT_TYPES, max_bytes: int = MAX_RESPONSE_BYTES) -> Tuple[bytes, Optional[str]]:
+    """
+    Streams a response body through the shared client.
+    Returns the body and the declared charset (if any). Raises FetchError on
+    HTTP errors, disallowed content types, oversized bodies or a blown deadline.
+    """
+    deadline = time.monotonic() + TOTAL_DEADLINE
+    try:
+        with _client.stream("GET", url) as response:
+            if response.status_code >= 400:
+                raise FetchError(f"HTTP {response.status_code} for {url}", response.status_code)
+
+            content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+            # Without a header the type is sniffed from the first chunk instead
+            if content_type and allowed_content_types and content_type not in allowed_content_types:
+                raise FetchError(f"Unsupported content type '{content_type}' for {url}")
+
+            declared_length = response.headers.get("Content-Length")
+            if declared_length and declared_length.isdigit() and int(declared_length) > max_bytes:
+                raise FetchError(f"Response too large ({declared_length} bytes) for {url}")
+
+            chunks = []
+            received = 0
+            for chunk in response.iter_bytes():
+                received += len(chunk)
+                if received > max_bytes:
+                    raise FetchError(f"Response exceeded {max_bytes} bytes for {url}")
+                if time.monotonic() > deadline:
+                    raise FetchError(f"Response exceeded {TOTAL_DEADLINE:.0f}s deadline for {url}")
+                if not chunks and not content_type and allowed_content_types:
+                    sniffed = sniff_content_type(chunk)
+                    if sniffed not in allowed_content_types:
+                        raise FetchError(f"Unsupported content type '{sniffed or 'unknown'}' (sniffed) for {url}")
+                chunks.append(chunk)
+
+            return b"".join(chunks), response.charset_encoding
+    except httpx.HTTPError as e:
+        raise FetchError(f"Request failed for {url}: {e}") from e
+
+def decode_body(body: bytes, charset: Optional[str] = None) -> str:
+    """
+    Decodes a page using, in order: the header charset, a <meta> charset in the
+    document head, strict UTF-8, and finally Windows-1252.
+    """
+    if body.startswith(b"\xef\xbb\xbf"):
+        return body[3:].decode("utf-8", errors="replace")
+    meta = _META_CHARSET.search(body[:SNIFF_BYTES])
+    for candidate in (charset, meta.group(1).decode("ascii") if meta else None):
+        if not candidate:
+            continue
+        try:
+            return body.decode(candidate, errors="replace")
+        except LookupError:
+            # Unknown charset name; try the next source
+            continue
+    try:
+        return body.decode("utf-8")
+    except UnicodeDecodeError:
+        return body.decode(FALLBACK_ENCODING, errors="replace")
+
+def fetch_text(url: str, allowed_content_types: Tuple[str, ...] = HTML_CONTENT_TYPES, max_bytes: int = MAX_RESPONSE_BYTES) -> str:
+    """Fetches a page through the shared client and decodes it (see decode_body)."""
+    body, charset = fetch_bytes(url, allowed_content_types, max_bytes)
+    return decode_body(body, charset)
+
+def close_client():
+    """Closes pooled connections (called on application shutdown)."""
+    _client.close()
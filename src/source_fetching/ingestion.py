@@ -0,0 +1,229 @@
+import os
+import time
+import asyncio
+import threading
+import calendar
+from datetime import datetime, timezone
+import feedparser
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from .http_client import fetch_bytes, FetchError
+from .scraper import fetch_article
+from ..nlp_processing.text_preprocessor import preprocess_text
+from ..nlp_processing.vector_representation import get_text_vectors
+from ..database.corpus import TrustedCorpus, trusted_corpus
+
+# RSS feeds and sitemaps for the trusted domains. INGEST_FEEDS (comma-separated
+# URLs) overrides the list, e.g. to point ingestion at a local fixture server.
+TRUSTED_FEEDS = [
+    "https://news.un.org/feed/subscribe/en/news/all/rss.xml",   # UN News Service
+    "https://press.un.org/en/rss.xml",                          # United Nations press releases
+    "https://pib.gov.in/RssMain.aspx?ModId=6&Lang=1&Regid=3",   # Press Information Bureau
+    "https://ddnews.gov.in/en/feed/",                           # DD News
+    "https://www.aninews.in/rss/national-news.xml",             # ANI News
+    "https://www.ptinews.com/sitemap.xml",                      # Press Trust of India (sitemap)
+]
+
+FEED_CONTENT_TYPES = (
+    "application/rss+xml", "application/atom+xml", "application/xml",
+    "text/xml", "text/plain", "application/x-rss+xml",
+)
+
+INGEST_INTERVAL_MINUTES = float(os.getenv("INGEST_INTERVAL_MINUTES", "0")) # 0 disables background ingestion
+MAX_ARTICLES_PER_RUN = 200
+MAX_CHILD_SITEMAPS = 3
+SCRAPE_WORKERS = 8
+EMBED_BATCH_SIZE = 32
+# URLs that could not be extracted are not retried for this long
+FAILED_URL_RETRY_HOURS = 24
+
+# url -> time of the last failed extraction
+_failed_urls: Dict[str, float] = {}
+
+# Shutdown coordination: cancelling the asyncio task does not stop a pass already
+# running in a worker thread, so the pass polls this flag between network calls.
+_stop_requested = threading.Event()
+_ingest_running = threading.Lock()
+
+_SITEMAP_NS = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+
+def configured_feeds() -> List[str]:
+    override = os.getenv("INGEST_FEEDS")
+    if override:
+        return [url.strip() for url in override.split(",") if url.strip()]
+    return TRUSTED_FEEDS
+
+def _parse_timestamp(value: Optional[str]) -> Optional[float]:
+    """Parses a sitemap lastmod (W3C datetime) into a UNIX timestamp."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+def _parse_sitemap(body: bytes, depth: int = 0) -> List[Dict]:
+    root = ET.fromstring(body)
+    if root.tag == f"{_SITEMAP_NS}sitemapindex":
+        if depth > 0:
+            return []
+        # Newest child sitemaps are usually listed first
+        entries = []
+        for loc in root.iter(f"{_SITEMAP_NS}loc"):
+            if len(entries) >= MAX_CHILD_SITEMAPS:
+                break
+            entries.append(loc.text.strip())
+        items = []
+        for child_url in entries:
+            try:
+                child_body, _ = fetch_bytes(child_url, allowed_content_types=FEED_CONTENT_TYPES)
+                items.extend(_parse_sitemap(child_body, depth + 1))
+            except (FetchError, ET.ParseError) as e:
+                print(f"Skipping child sitemap {child_url}: {e}")
+        return items
+
+    items = []
+    for url_node in root.iter(f"{_SITEMAP_NS}url"):
+        loc = url_node.findtext(f"{_SITEMAP_NS}loc")
+        if loc:
+            items.append({
+                "url": loc.strip(),
+                "title": "",
+                "published": _parse_timestamp(url_node.findtext(f"{_SITEMAP_NS}lastmod")),
+            })
+    return items
+
+def discover_feed_entries(feed_url: str) -> List[Dict]:
+    """Lists article URLs (with title and publish time when known) from an RSS/Atom feed or sitemap."""
+    body, _ = fetch_bytes(feed_url, allowed_content_types=FEED_CONTENT_TYPES)
+    head = body[:500].lower()
+    if b"<urlset" in head or b"<sitemapindex" in head:
+        return _parse_sitemap(body)
+
+    feed = feedparser.parse(body)
+    items = []
+    for entry in feed.entries:
+        link = entry.get("link")
+        if not link:
+            continue
+        published = entry.get("published_parsed") or entry.get("updated_parsed")
+        items.append({
+            "url": link,
+            "title": entry.get("title", ""),
+            "published": float(calendar.timegm(published)) if published else None,
+        })
+    return items
+
+def ingest_once(corpus: TrustedCorpus = trusted_corpus, feeds: Optional[List[str]] = None) -> int:
+    """
+    Runs one ingestion pass: discovers new articles from the feeds, scrapes them,
+    embeds them in batches, adds them to the corpus, applies retention and saves.
+    Only one process (gunicorn worker) ingests at a time; the others reload its
+    latest save instead. Returns the number of articles added.
+    """
+    feeds = feeds if feeds is not None else configured_feeds()
+    with _ingest_running, corpus.ingestion_lock() as is_writer:
+        # Pick up what the writer saved last (our own previous save, or another worker's)
+        corpus.load()
+        if not is_writer or _stop_requested.is_set():
+            return 0
+        return _ingest(corpus, feeds)
+
+def _ingest(corpus: TrustedCorpus, feeds: List[str]) -> int:
+
+    # 1. Discovery
+    # Items the corpus would drop at once (older than retention), already ingested or
+    # recently failed are skipped before any scraping.
+    now = time.time()
+    cutoff = corpus.retention_cutoff()
+    retry_after = now - FAILED_URL_RETRY_HOURS * 3600
+    for url in [url for url, failed_at in _failed_urls.items() if failed_at < retry_after]:
+        del _failed_urls[url]
+
+    seen = set()
+    per_feed = []
+    for feed_url in feeds:
+        if _stop_requested.is_set():
+            return 0
+        try:
+            items = discover_feed_entries(feed_url)
+        except Exception as e:
+            print(f"Error reading feed {feed_url}: {e}")
+            continue
+        fresh = []
+        for item in items:
+            url = item["url"]
+            if url in seen or corpus.has(url) or url in _failed_urls:
+                continue
+            if item["published"] is not None and item["published"] < cutoff:
+                continue
+            seen.add(url)
+            fresh.append(item)
+        # Newest first; undated items last
+        fresh.sort(key=lambda item: item["published"] or 0, reverse=True)
+        per_feed.append(fresh)
+
+    # Round-robin across feeds so early feeds cannot take the whole per-run cap
+    items = []
+    for rank in range(max((len(feed_items) for feed_items in per_feed), default=0)):
+        items.extend(feed_items[rank] for feed_items in per_feed if rank < len(feed_items))
+    items = items[:MAX_ARTICLES_PER_RUN]
+    print(f"Ingestion: {len(items)} new articles from {len(feeds)} feeds.")
+    if not items:
+        return 0
+
+    # 2. Extraction (parallel; the pooled HTTP client is thread-safe)
+    with ThreadPoolExecutor(max_workers=SCRAPE_WORKERS) as executor:
+        texts = list(executor.map(lambda item: None if _stop_requested.is_set() else fetch_article(item["url"]), items))
+    if _stop_requested.is_set():
+        # Unscraped items are not failures; the next run picks them up again
+        return 0
+
+    entries = []
+    for item, text in zip(items, texts):
+        if not text:
+            _failed_urls[item["url"]] = now
+            continue
+        entries.append({
+            "url": item["url"],
+            "title": item["title"],
+            "text": text,
+            "published": item["published"] or now,
+            "ingested_at": now,
+        })
+
+    # 3. Preprocessing and embedding in bulk batches
+    added = 0
+    for start in range(0, len(entries), EMBED_BATCH_SIZE):
+        batch = entries[start:start + EMBED_BATCH_SIZE]
+        vectors = get_text_vectors([preprocess_text(entry["text"]) for entry in batch])
+        corpus.add_batch(batch, vectors)
+        added += len(batch)
+
+    # 4. Retention and persistence
+    dropped = corpus.prune()
+    corpus.save()
+    print(f"Ingestion: added {added}, dropped {dropped}, corpus size {len(corpus)}.")
+    return added
+
+def stop_ingestion(timeout: float) -> bool:
+    """Asks a running pass to stop and waits up to `timeout` seconds. Returns True once none is running."""
+    _stop_requested.set()
+    if not _ingest_running.acquire(timeout=timeout):
+        return False
+    _ingest_running.release()
+    return True
+
+async def run_ingestion_loop(interval_minutes: float = INGEST_INTERVAL_MINUTES, corpus: TrustedCorpus = trusted_corpus):
+    """Background task: ingest every `interval_minutes` without blocking the event loop."""
+    while not _stop_requested.is_set():
+        try:
+            await asyncio.to_thread(ingest_once, corpus)
+        except Exception as e:
+            print(f"Error during ingestion: {e}")
+        await asyncio.sleep(interval_minutes * 60)
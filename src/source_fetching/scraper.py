@@ -1,40 +1,50 @@
-import requests
 from newspaper import Article, Config
 from typing import Optional
 import nltk
 
+from .extractors import extract_text
+from .http_client import fetch_text, USER_AGENT
+
 # Ensure necessary NLTK data is available for newspaper3k
 try:
     nltk.data.find('tokenizers/punkt')
 except LookupError:
     nltk.download('punkt', quiet=True)
 
+REQUEST_TIMEOUT = 15
+
+# newspaper3k config is built once and reused; it is only used to parse HTML we already downloaded
+_newspaper_config = Config()
+_newspaper_config.browser_user_agent = USER_AGENT
+_newspaper_config.request_timeout = REQUEST_TIMEOUT
+_newspaper_config.fetch_images = False # We only need text
+
+def download_html(url: str) -> str:
+    """Downloads a page through the shared pooled HTTP client (size, type and deadline limited)."""
+    return fetch_text(url)
+
+def parse_with_newspaper(url: str, html: str) -> str:
+    """Extracts article text from already downloaded HTML using newspaper3k."""
+    article = Article(url, config=_newspaper_config)
+    article.download(input_html=html)
+    article.parse()
+    return article.text
+
 def fetch_article(url: str) -> Optional[str]:
     """
-    Safely fetches and extracts text from a URL using newspaper3k.
+    Safely fetches and extracts text from a URL.
+    Trusted domains go through a fast site-specific extractor; everything else
+    (and any page the fast path cannot handle) falls back to newspaper3k.
     """
-    user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-    
-    config = Config()
-    config.browser_user_agent = user_agent
-    config.request_timeout = 15
-    config.fetch_images = False # We only need text
-    
     try:
-        print(f"DEBUG: Fetching [{url}] with newspaper3k...")
-        
-        article = Article(url, config=config)
-        article.download()
-        
-        # Check if download was successful (sometimes it doesn't raise but has no html)
-        if not article.download_state == 2: # ArticleDownloadState.SUCCESS is 2
-             # Try simple requests fallback if newspaper download fails (sometimes happens with specific blocking)
-             # But for now, let's rely on newspaper's own logic or raise
-             pass
+        print(f"DEBUG: Fetching [{url}]...")
+        html = download_html(url)
 
-        article.parse()
-        
-        text = article.text
+        text = extract_text(url, html)
+        if text:
+            print(f"DEBUG: Fast extractor handled [{url}]")
+        else:
+            text = parse_with_newspaper(url, html)
         
         # Basic validation
         if not text or len(text.strip()) < 100:
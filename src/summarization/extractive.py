@@ -0,0 +1,88 @@
+import re
+import numpy as np
+import nltk
+from typing import List
+
+from ..nlp_processing.vector_representation import get_text_vectors
+
+# Local, CPU-only extractive engine built on the already loaded MiniLM model.
+# Sentences are ranked by a mix of closeness to the document centroid and
+# TextRank centrality over the sentence similarity graph.
+MAX_SENTENCES = 80          # Only the first sentences are ranked; news leads carry the facts
+TEXTRANK_DAMPING = 0.85
+TEXTRANK_ITERATIONS = 30
+CENTROID_WEIGHT = 0.5
+
+# Claim heuristics: factual, attributable statements score higher than hedged or rhetorical ones
+_REPORTING_WORDS = re.compile(r"\b(said|says|announced|stated|reported|confirmed|according to|killed|signed|approved|launched|arrested|won|declared)\b", re.IGNORECASE)
+_HEDGE_WORDS = re.compile(r"\b(may|might|could|perhaps|possibly|i think|we believe|opinion|should)\b", re.IGNORECASE)
+_NUMBER = re.compile(r"\d")
+_INNER_PROPER_NOUN = re.compile(r"\s[A-Z][a-z]+")
+
+def split_sentences(text: str) -> List[str]:
+    """Splits text into sentences with NLTK, falling back to punctuation splitting."""
+    try:
+        sentences = nltk.sent_tokenize(text)
+    except Exception:
+        sentences = re.split(r"(?<=[.!?])\s+", text)
+    return [" ".join(s.split()) for s in sentences if len(s.split()) >= 4]
+
+def rank_sentences(sentences: List[str]) -> np.ndarray:
+    """Scores sentences by centroid similarity and TextRank centrality (both scaled to 0-1)."""
+    vectors = get_text_vectors(sentences)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = vectors / np.where(norms == 0, 1, norms)
+
+    centroid = vectors.mean(axis=0)
+    centroid_norm = np.linalg.norm(centroid)
+    centroid_scores = vectors @ (centroid / centroid_norm) if centroid_norm else np.zeros(len(sentences))
+
+    # TextRank: power iteration over the row-normalized similarity graph
+    similarity = np.clip(vectors @ vectors.T, 0, None)
+    np.fill_diagonal(similarity, 0)
+    row_sums = similarity.sum(axis=1, keepdims=True)
+    transition = similarity / np.where(row_sums == 0, 1, row_sums)
+    ranks = np.full(len(sentences), 1.0 / len(sentences))
+    for _ in range(TEXTRANK_ITERATIONS):
+        ranks = (1 - TEXTRANK_DAMPING) / len(sentences) + TEXTRANK_DAMPING * transition.T @ ranks
+
+    def scale(scores):
+        spread = scores.max() - scores.min()
+        return (scores - scores.min()) / spread if spread else np.ones_like(scores)
+
+    return CENTROID_WEIGHT * scale(centroid_scores) + (1 - CENTROID_WEIGHT) * scale(ranks)
+
+def summarize_extractive(text: str, num_sentences: int = 3) -> str:
+    """Picks the most central sentences and returns them in their original order."""
+    sentences = split_sentences(text)[:MAX_SENTENCES]
+    if len(sentences) <= num_sentences:
+        return " ".join(sentences) if sentences else text[:200]
+
+    scores = rank_sentences(sentences)
+    top = sorted(np.argsort(scores)[::-1][:num_sentences])
+    return " ".join(sentences[i] for i in top)
+
+def extract_claims_extractive(text: str, num_claims: int = 3) -> List[str]:
+    """Selects the sentences most likely to be checkable claims, in their original order."""
+    sentences = split_sentences(text)[:MAX_SENTENCES]
+    if not sentences:
+        return []
+    if len(sentences) <= num_claims:
+        return sentences
+
+    scores = rank_sentences(sentences)
+    for i, sentence in enumerate(sentences):
+        words = len(sentence.split())
+        if _NUMBER.search(sentence):
+            scores[i] += 0.3
+        if _INNER_PROPER_NOUN.search(sentence):
+            scores[i] += 0.2
+        if _REPORTING_WORDS.search(sentence):
+            scores[i] += 0.3
+        if _HEDGE_WORDS.search(sentence) or sentence.endswith("?"):
+            scores[i] -= 0.4
+        if words < 8 or words > 45:
+            scores[i] -= 0.3
+
+    top = sorted(np.argsort(scores)[::-1][:num_claims])
+    return [sentences[i] for i in top]
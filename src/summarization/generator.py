@@ -1,9 +1,11 @@
 import os
-import time
+from typing import Literal, get_args
 from google import genai
 from google.genai import types
 from dotenv import load_dotenv
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+
+from ..resilience.guard import ProviderGuard
+from .extractive import summarize_extractive, extract_claims_extractive
 
 # Load environment variables
 load_dotenv()
@@ -17,21 +19,63 @@ if api_key:
 else:
     print("WARNING: GEMINI_API_KEY not found in .env")
 
-# Retry configuration: Wait 2^x * 1 second between retries, stop after 5 attempts
-@retry(
-    stop=stop_after_attempt(5),
-    wait=wait_exponential(multiplier=1, min=2, max=10),
-    retry=retry_if_exception_type(Exception) # Retrying on general Exception as GenAI errors vary
+# Rate limit matched to the Gemini quota; the circuit opens when the quota is
+# exhausted so callers drop straight to their local fallbacks.
+# Hedged requests are off unless GEMINI_HEDGE_AFTER (seconds) is set.
+gemini_guard = ProviderGuard(
+    "gemini",
+    requests_per_minute=float(os.getenv("GEMINI_RPM", "15")),
+    hedge_after=float(os.getenv("GEMINI_HEDGE_AFTER")) if os.getenv("GEMINI_HEDGE_AFTER") else None
 )
+
+# Engine per stage: "llm" (Gemini), "local" (extractive, CPU-only) or
+# "auto" (Gemini while it is configured and healthy, local otherwise).
+Engine = Literal["llm", "local", "auto"]
+ENGINES = get_args(Engine)
+
+def _validate_engine(engine: str, source: str) -> str:
+    if engine not in ENGINES:
+        raise ValueError(f"Invalid {source} '{engine}'; expected one of {', '.join(ENGINES)}.")
+    return engine
+
+# A typo in the environment fails at startup instead of silently selecting Gemini
+SUMMARY_ENGINE = _validate_engine(os.getenv("SUMMARY_ENGINE", "auto"), "SUMMARY_ENGINE")
+CLAIMS_ENGINE = _validate_engine(os.getenv("CLAIMS_ENGINE", "auto"), "CLAIMS_ENGINE")
+
+def _use_local(engine: str) -> bool:
+    _validate_engine(engine, "engine")
+    return engine == "local" or (engine == "auto" and (not client or not gemini_guard.healthy))
+
+def _local_summary(text: str) -> str:
+    try:
+        return summarize_extractive(text)
+    except Exception as e:
+        print(f"Error generating extractive summary: {e}")
+        return text[:200] + "..." if text else "Summary unavailable."
+
+def _local_claims(text: str) -> list[str]:
+    try:
+        claims = extract_claims_extractive(text)
+    except Exception as e:
+        print(f"Error extracting claims locally: {e}. Using sentence-based fallback.")
+        # A simple sentence splitter (splitting on period followed by space)
+        claims = [s.strip() for s in text.split('.') if s.strip()][:5]
+    return claims or ["No content available for extraction."]
+
 def generate_content_with_retry(prompt: str):
     # Using gemini-1.5-flash for better stability/quota
-    return client.models.generate_content(
+    # Retries (retryable errors only), rate limiting and fail-fast are handled by the guard
+    return gemini_guard.call(
+        client.models.generate_content,
         model='gemini-1.5-flash', 
         contents=prompt
     )
 
-def generate_summary(text: str) -> str:
-    """Generates a concise 3-sentence summary of the given text using Gemini."""
+def generate_summary(text: str, engine: Engine | None = None) -> str:
+    """Generates a concise 3-sentence summary of the given text using Gemini or the local extractive engine."""
+    engine = engine or SUMMARY_ENGINE
+    if _use_local(engine):
+        return _local_summary(text)
     if not client:
         return "Error: Gemini API key not configured."
     
@@ -41,11 +85,14 @@ def generate_summary(text: str) -> str:
         return response.text.strip()
     except Exception as e:
         print(f"Error generating summary: {e}")
-        # Fallback to simple truncation if API fails
-        return text[:200] + "..." if text else "Summary unavailable."
+        # Fall back to the local extractive summary if the API fails
+        return _local_summary(text)
 
-def extract_claims(text: str) -> list[str]:
-    """Extracts core claims from the text. Falls back to first 5 sentences if extraction fails."""
+def extract_claims(text: str, engine: Engine | None = None) -> list[str]:
+    """Extracts core claims from the text. Falls back to local claim selection if the LLM fails."""
+    engine = engine or CLAIMS_ENGINE
+    if _use_local(engine):
+        return _local_claims(text)
     if not client:
         return ["Gemini API key not configured. Using fallback."]
 
@@ -68,21 +115,13 @@ def extract_claims(text: str) -> list[str]:
         return claims[:3]
         
     except Exception as e:
-        print(f"Error extracting claims: {e}. Using sentence-based fallback.")
-        # Fallback: Extract first 5 sentences if LLM fails
-        # A simple sentence splitter (splitting on period followed by space)
-        sentences = [s.strip() for s in text.split('.') if s.strip()]
-        fallback_claims = sentences[:5]
-        
-        if not fallback_claims:
-            return ["No content available for extraction."]
-            
-        return fallback_claims
+        print(f"Error extracting claims: {e}. Using local fallback.")
+        return _local_claims(text)
 
 def generate_search_query(text: str) -> str:
-    """Generates an optimized search engine query based on the text."""
+    """Generates an optimized search engine query based on the text. Returns "" if the LLM is unavailable."""
     if not client:
-        return "news"
+        return ""
 
     try:
         prompt = (
@@ -106,7 +145,7 @@ def generate_search_query(text: str) -> str:
         return response.text.strip().replace('"', '').replace("'", "")
     except Exception as e:
         print(f"Error generating search query: {e}")
-        return "latest news findings"
+        return ""
 
 def extract_event_and_entities(text: str) -> dict:
     """
@@ -0,0 +1,91 @@
+import sys
+import io
+import os
+import tempfile
+import threading
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+# Apply encoding fix
+sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+from src.database.corpus import TrustedCorpus
+from src.source_fetching.ingestion import ingest_once
+from src.nlp_processing.text_preprocessor import preprocess_text
+from src.nlp_processing.vector_representation import get_text_vector
+
+# Fixture articles served by a local feed server (no external network needed)
+ARTICLES = {
+    "flood.html": (
+        "Assam floods displace thousands",
+        "Heavy monsoon rains caused severe flooding across Assam on Monday, displacing more than 20,000 people. "
+        "The state disaster management authority said rescue teams were deployed in eight districts. "
+        "Relief camps have been set up and the Indian Army is assisting with evacuations."
+    ),
+    "summit.html": (
+        "UN climate summit opens",
+        "The United Nations climate summit opened in Geneva on Tuesday with delegates from 150 countries. "
+        "The Secretary-General urged nations to strengthen their emission reduction targets. "
+        "Negotiators are expected to debate a new adaptation finance framework over the next two weeks."
+    ),
+    "budget.html": (
+        "Parliament passes budget",
+        "Parliament passed the annual budget on Wednesday after a lengthy debate in both houses. "
+        "The finance minister said the allocation for infrastructure was increased by twelve percent. "
+        "Opposition members walked out during the final vote, citing concerns over rural spending."
+    ),
+}
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+def write_fixtures(directory, base_url):
+    for filename, (title, body) in ARTICLES.items():
+        paragraphs = "".join(f"<p>{sentence.strip()}.</p>" for sentence in body.split(". ") if sentence)
+        with open(os.path.join(directory, filename), "w", encoding="utf-8") as f:
+            f.write(f"<html><head><meta charset='utf-8'><title>{title}</title></head>"
+                    f"<body><article><h1>{title}</h1>{paragraphs}</article></body></html>")
+
+    # Two articles in an RSS feed, one in a sitemap
+    items = "".join(
+        f"<item><title>{ARTICLES[name][0]}</title><link>{base_url}/{name}</link>"
+        f"<pubDate>Mon, 19 Oct 2026 10:00:00 GMT</pubDate></item>"
+        for name in ("flood.html", "summit.html")
+    )
+    with open(os.path.join(directory, "rss.xml"), "w", encoding="utf-8") as f:
+        f.write(f"<?xml version='1.0'?><rss version='2.0'><channel><title>Fixture</title>{items}</channel></rss>")
+    with open(os.path.join(directory, "sitemap.xml"), "w", encoding="utf-8") as f:
+        f.write("<?xml version='1.0'?><urlset xmlns='http://www.sitemaps.org/schemas/sitemap/0.9'>"
+                f"<url><loc>{base_url}/budget.html</loc><lastmod>2026-10-19</lastmod></url></urlset>")
+
+def main():
+    with tempfile.TemporaryDirectory() as fixtures, tempfile.TemporaryDirectory() as corpus_dir:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=fixtures))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        write_fixtures(fixtures, base_url)
+        feeds = [f"{base_url}/rss.xml", f"{base_url}/sitemap.xml"]
+
+        corpus = TrustedCorpus(corpus_dir, max_age_days=36500)
+        added = ingest_once(corpus, feeds)
+        print(f"First run added {added} articles (expected {len(ARTICLES)}).")
+
+        added_again = ingest_once(corpus, feeds)
+        print(f"Second run added {added_again} articles (expected 0).")
+
+        reloaded = TrustedCorpus(corpus_dir, max_age_days=36500)
+        reloaded.load()
+        query = "Flooding in Assam forced thousands from their homes and the army helped rescue them."
+        matches = reloaded.search(get_text_vector(preprocess_text(query)), top_k=3, min_similarity=0.0)
+        print("Top matches after reload:")
+        for entry, similarity in matches:
+            print(f"  {similarity:.2f}  {entry['url']}")
+
+        server.shutdown()
+        ok = added == len(ARTICLES) and added_again == 0 and matches and matches[0][0]["url"].endswith("flood.html")
+        print("\nSUCCESS: ingestion verified." if ok else "\nFAILURE: ingestion check failed.")
+
+if __name__ == "__main__":
+    main()